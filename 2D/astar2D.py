@@ -1,5 +1,9 @@
 # grid_map.py
 import math
+import time
+
+INF = float("inf")
+SQRT2 = math.sqrt(2)
 
 
 class Node:
@@ -20,6 +24,8 @@ class Node:
 # astar.py
 from heapq import heappush, heappop
 
+from tracing import POP, EXPAND, PUSH, GOAL
+
 def heuristic(a, b):
     # distanza di Manhattan
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -36,21 +42,82 @@ def euclidean_heuristic(a, b):
 def aggressive_manhattan(a, b):
     return 2.5 * (abs(a[0] - b[0]) + abs(a[1] - b[1]))
 
-
-def astar(grid, start, goal):
+def octile_heuristic(a, b):
+    # griglie 8-connesse: passi diagonali di costo sqrt(2)
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return dx + dy + (SQRT2 - 2) * min(dx, dy)
+
+
+# euristiche predefinite che i motori calcolano inline invece di chiamare la funzione per ogni vicino
+HEURISTIC_KERNELS = {
+    zero_heuristic: "zero",
+    heuristic: "manhattan",
+    manhattan_heuristic: "manhattan",
+    euclidean_heuristic: "euclidean",
+    octile_heuristic: "octile",
+}
+KERNEL_CALL, KERNEL_SUM, KERNEL_SQRT, KERNEL_OCTILE = 0, 1, 2, 3
+
+# tie-breaking a parità di f: le voci dello heap sono (f, a * h + b * g, c * contatore, nodo)
+# con il contatore di inserimento sempre presente, così Node.__lt__ non viene mai chiamato
+TIE_BREAKING = {
+    "fifo": (0, 0, 1),     # il primo inserito
+    "lifo": (0, 0, -1),    # l'ultimo inserito
+    "low_h": (1, 0, 1),    # h minore, il più vicino al goal
+    "high_g": (0, -1, 1),  # g maggiore, il più lontano dallo start
+}
+
+
+def tie_breaking_weights(policy):
+    if policy not in TIE_BREAKING:
+        raise ValueError(f"tie_breaking non valido: usa uno tra {', '.join(TIE_BREAKING)}")
+    return TIE_BREAKING[policy]
+
+
+def heuristic_kernel(heuristic, goal, rows, cols):
+    """
+    Le euristiche predefinite sono separabili per riga e colonna: hx[r] e hy[c] si calcolano
+    una volta per query (O(rows + cols)) e h(r, c) diventa hx[r] + hy[c] (zero, manhattan),
+    sqrt(hx[r] + hy[c]) (euclidean, vettori al quadrato) o la formula octile su hx[r] e hy[c].
+    Stessi valori delle funzioni, bit per bit.
+
+    :return: (tipo, hx, hy); per le altre funzioni (KERNEL_CALL, None, None)
+    """
+    kind = HEURISTIC_KERNELS.get(heuristic)
+    gx, gy = goal
+    if kind is None:
+        return KERNEL_CALL, None, None
+    if kind == "zero":
+        return KERNEL_SUM, [0] * rows, [0] * cols
+    if kind == "manhattan":
+        return KERNEL_SUM, [abs(r - gx) for r in range(rows)], [abs(c - gy) for c in range(cols)]
+    if kind == "euclidean":
+        return KERNEL_SQRT, [(r - gx) ** 2 for r in range(rows)], [(c - gy) ** 2 for c in range(cols)]
+    return KERNEL_OCTILE, [abs(r - gx) for r in range(rows)], [abs(c - gy) for c in range(cols)]
+
+
+def astar(grid, start, goal, trace=None, tie_breaking="fifo"):
     start_node = Node(start)
     goal_node = Node(goal)
+    tie_h, tie_g, tie_count = tie_breaking_weights(tie_breaking)
+    count = 0
 
     open_list = []
     closed_set = set()
+    best_g = {start: 0}  # miglior g noto per ogni posizione in open list
 
-    heappush(open_list, (start_node.f, start_node))
+    heappush(open_list, (start_node.f, 0, 0, start_node))
 
     while open_list:
-        _, current = heappop(open_list)
-        print(f"[INFO] Espansione nodo: {current.position} | g={current.g} h={current.h} f={current.f}")
+        current = heappop(open_list)[-1]
+        if current.position in closed_set:
+            continue  # voce obsoleta, già espansa con g migliore
+        if trace is not None:
+            trace(POP, current.position, current.g, current.h, current.f)
 
         if current == goal_node:
+            if trace is not None:
+                trace(GOAL, current.position, current.g, current.h, current.f)
             # ricostruisci il path
             path = []
             while current:
@@ -64,21 +131,27 @@ def astar(grid, start, goal):
             # reverse
 
         closed_set.add(current.position)
+        if trace is not None:
+            trace(EXPAND, current.position, current.g, current.h, current.f)
 
         for neighbor in get_neighbors(current, grid):
             if neighbor.position in closed_set:
                 continue
 
             neighbor.g = current.g + 1
-            neighbor.h = heuristic(neighbor.position, goal_node.position)
-            neighbor.f = neighbor.g + neighbor.h
 
             # evita duplicati peggiori
-            if any(n.position == neighbor.position and n.f <= neighbor.f for _, n in open_list):
+            if neighbor.g >= best_g.get(neighbor.position, INF):
                 continue
+            best_g[neighbor.position] = neighbor.g
+
+            neighbor.h = heuristic(neighbor.position, goal_node.position)
+            neighbor.f = neighbor.g + neighbor.h
 
-            heappush(open_list, (neighbor.f, neighbor))
-            print(f"  ↳ Considero vicino: {neighbor.position} | g={neighbor.g} h={neighbor.h} f={neighbor.f}")
+            count += 1
+            heappush(open_list, (neighbor.f, tie_h * neighbor.h + tie_g * neighbor.g, tie_count * count, neighbor))
+            if trace is not None:
+                trace(PUSH, neighbor.position, neighbor.g, neighbor.h, neighbor.f)
 
     return None, {
         "nodi_espansi": len(closed_set),
@@ -86,22 +159,37 @@ def astar(grid, start, goal):
     }
     # Nessun percorso trovato
 
-def astarh(grid, start, goal, heuristic):
+def astarh(grid, start, goal, heuristic, trace=None, epsilon=1.0, tie_breaking="fifo"):
+    """
+    A* con euristica a scelta. Con epsilon > 1 è Weighted A* (f = g + epsilon * h):
+    espande meno nodi e, con euristica consistente, il costo trovato è al più
+    epsilon volte l'ottimo (stats["suboptimality_bound"]).
+
+    :param tie_breaking: ordine tra nodi con lo stesso f, una delle chiavi di TIE_BREAKING
+    """
     start_node = Node(start)
     goal_node = Node(goal)
+    kernel, hx, hy = heuristic_kernel(heuristic, goal, len(grid), len(grid[0]))
+    tie_h, tie_g, tie_count = tie_breaking_weights(tie_breaking)
 
     open_list = []
     closed_set = set()
+    best_g = {start: 0}
     nodes_generated = 0
     open_list_max = 1
 
-    heappush(open_list, (start_node.f, start_node))
+    heappush(open_list, (start_node.f, 0, 0, start_node))
 
     while open_list:
-        _, current = heappop(open_list)
-        print(f"[INFO] Espansione nodo: {current.position} | g={current.g} h={current.h} f={current.f}")
+        current = heappop(open_list)[-1]
+        if current.position in closed_set:
+            continue
+        if trace is not None:
+            trace(POP, current.position, current.g, current.h, current.f)
 
         if current == goal_node:
+            if trace is not None:
+                trace(GOAL, current.position, current.g, current.h, current.f)
             path = []
             while current:
                 path.append(current.position)
@@ -111,33 +199,153 @@ def astarh(grid, start, goal, heuristic):
                 "nodi_espansi": len(closed_set),
                 "lunghezza_percorso": len(path),
                 "nodes_generated": nodes_generated,
-                "open_list_max": open_list_max
+                "open_list_max": open_list_max,
+                "suboptimality_bound": epsilon
             }
 
         closed_set.add(current.position)
+        if trace is not None:
+            trace(EXPAND, current.position, current.g, current.h, current.f)
 
         for neighbor in get_neighbors(current, grid):
             if neighbor.position in closed_set:
                 continue
 
             neighbor.g = current.g + 1
-            neighbor.h = heuristic(neighbor.position, goal_node.position)
-            neighbor.f = neighbor.g + neighbor.h
-
-            if any(n.position == neighbor.position and n.f <= neighbor.f for _, n in open_list):
+            if neighbor.g >= best_g.get(neighbor.position, INF):
                 continue
+            best_g[neighbor.position] = neighbor.g
+
+            nx, ny = neighbor.position
+            if kernel == KERNEL_SUM:
+                neighbor.h = hx[nx] + hy[ny]
+            elif kernel == KERNEL_SQRT:
+                neighbor.h = math.sqrt(hx[nx] + hy[ny])
+            elif kernel == KERNEL_OCTILE:
+                dx, dy = hx[nx], hy[ny]
+                neighbor.h = dx + dy + (SQRT2 - 2) * (dx if dx < dy else dy)
+            else:
+                neighbor.h = heuristic(neighbor.position, goal_node.position)
+            neighbor.f = neighbor.g + epsilon * neighbor.h
 
-            heappush(open_list, (neighbor.f, neighbor))
             nodes_generated += 1
+            heappush(open_list, (neighbor.f, tie_h * neighbor.h + tie_g * neighbor.g, tie_count * nodes_generated, neighbor))
             open_list_max = max(open_list_max, len(open_list))
-            print(f"  ↳ Considero vicino: {neighbor.position} | g={neighbor.g} h={neighbor.h} f={neighbor.f}")
+            if trace is not None:
+                trace(PUSH, neighbor.position, neighbor.g, neighbor.h, neighbor.f)
 
     return None, {
         "nodi_espansi": len(closed_set),
         "lunghezza_percorso": 0,
         "nodes_generated": nodes_generated,
-        "open_list_max": open_list_max
+        "open_list_max": open_list_max,
+        "suboptimality_bound": epsilon
+    }
+
+
+def ara_star(grid, start, goal, heuristic, epsilon=3.0, epsilon_step=0.5, deadline=None):
+    """
+    ARA* (Likhachev et al.): una prima soluzione veloce con f = g + epsilon * h, poi epsilon
+    scende di epsilon_step e la ricerca riusa i g già calcolati (gli stati inconsistenti
+    tornano in open) finché il percorso è ottimo o scade il tempo.
+
+    :param deadline: secondi a disposizione dalla chiamata, None = fino all'ottimo
+    :return: (path, stats) dell'ultima soluzione; stats["suboptimality_bound"] è il limite
+             garantito costo / ottimo (INF se non si è trovato alcun percorso in tempo),
+             stats["solutions"] la lista di (secondi, lunghezza, limite) di ogni soluzione
+    """
+    t0 = time.perf_counter()
+    rows, cols = len(grid), len(grid[0])
+    g = {start: 0}
+    parent = {start: None}
+    h_cache = {}
+
+    def h(position):
+        if position not in h_cache:
+            h_cache[position] = heuristic(position, goal)
+        return h_cache[position]
+
+    open_list = [(epsilon * h(start), start)]
+    open_key = {start: open_list[0][0]}  # chiave corrente di ogni stato in open, le altre voci sono obsolete
+    closed_set = set()
+    incons = set()
+    expanded = 0
+    nodes_generated = 0
+    open_list_max = 1
+    timed_out = False
+    best_path, bound, solutions = None, INF, []
+
+    def min_open():
+        while open_list and open_key.get(open_list[0][1]) != open_list[0][0]:
+            heappop(open_list)
+        return open_list[0][0] if open_list else INF
+
+    while True:
+        # improve_path: espande finché il goal non ha la chiave minima
+        while g.get(goal, INF) > min_open():
+            if deadline is not None and time.perf_counter() - t0 > deadline:
+                timed_out = True
+                break
+            _, current = heappop(open_list)
+            del open_key[current]
+            closed_set.add(current)
+            expanded += 1
+
+            x, y = current
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < rows and 0 <= ny < cols) or grid[nx][ny] != 0:
+                    continue
+                neighbor = (nx, ny)
+                new_g = g[current] + 1
+                if new_g >= g.get(neighbor, INF):
+                    continue
+                g[neighbor] = new_g
+                parent[neighbor] = current
+                if neighbor in closed_set:
+                    incons.add(neighbor)
+                else:
+                    key = new_g + epsilon * h(neighbor)
+                    open_key[neighbor] = key
+                    heappush(open_list, (key, neighbor))
+                    nodes_generated += 1
+                    open_list_max = max(open_list_max, len(open_list))
+
+        if timed_out:
+            break
+
+        # limite garantito: costo trovato / minimo g + h tra gli stati ancora da sistemare
+        lower = min([g[s] + h(s) for s in list(open_key) + list(incons)], default=INF)
+        if goal in g:
+            bound = min(epsilon, max(1.0, g[goal] / lower)) if lower > 0 else 1.0
+            best_path = []
+            node = goal
+            while node is not None:
+                best_path.append(node)
+                node = parent[node]
+            best_path.reverse()
+            solutions.append((round(time.perf_counter() - t0, 6), len(best_path), bound))
+        if goal not in g or bound <= 1:
+            break
+
+        epsilon = max(1.0, epsilon - epsilon_step)
+        for s in incons:
+            open_key[s] = None
+        incons = set()
+        open_list = [(g[s] + epsilon * h(s), s) for s in open_key]
+        open_key = {s: key for key, s in open_list}
+        open_list.sort()
+        closed_set = set()
+
+    stats = {
+        "nodi_espansi": expanded,
+        "lunghezza_percorso": len(best_path) if best_path else 0,
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+        "suboptimality_bound": bound,
+        "solutions": solutions
     }
+    return best_path, stats
 
 
 def get_neighbors(node, grid):
@@ -0,0 +1,52 @@
+# batch2D.py
+# Molte query (start, goal) sulla stessa griglia: la griglia viene preparata una volta,
+# i buffer di ricerca sono riutilizzati tra le query (reset O(1) per epoca) e i lotti
+# di query vengono distribuiti su un pool di processi, ognuno con la propria copia della mappa.
+# Le componenti connesse sono etichettate una volta: le coppie non collegate non avviano la ricerca.
+import os
+import sys
+
+from components2D import component_labels
+from grid_engine import SearchBuffers, prepare_grid, astar_flat, grid_queue
+
+# il pool di processi è condiviso con Grafi/: l'implementazione è in common/worker_pool.py
+_COMMON = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+if _COMMON not in sys.path:
+    sys.path.append(_COMMON)
+
+from worker_pool import run_batches  # noqa: E402
+
+
+def _search_task(prepared, heuristic, options):
+    # una volta per processo: i buffer sono riutilizzati da tutte le query del processo
+    buffers = SearchBuffers(prepared[2] * prepared[3])
+    return lambda pair: astar_flat(prepared, pair[0], pair[1], heuristic, buffers=buffers, **options)
+
+
+def astar_many(grid, pairs, heuristic, workers=1, batch_size=256, stream=False,
+               connectivity=4, corner_cutting="never", weighted=False, tie_breaking="fifo",
+               queue="auto"):
+    """
+    Esegue astar_array per ogni coppia (start, goal) di pairs.
+
+    :param grid: griglia come per astar_array
+    :param pairs: lista di coppie (start, goal)
+    :param heuristic: con workers > 1 deve essere una funzione di modulo (picklable), non una lambda
+    :param workers: numero di processi; con 1 tutto gira nel processo corrente
+    :param batch_size: query per task inviato al pool
+    :param stream: se False restituisce la lista dei (path, stats) nell'ordine di pairs,
+                   se True un generatore di (indice, (path, stats)) nell'ordine di completamento
+    :param tie_breaking: come in astar_array
+    :param queue: come in astar_array, "auto" viene risolto una volta per tutte le query
+    """
+    pairs = list(pairs)
+    prepared = prepare_grid(grid, weighted)
+    options = {
+        "connectivity": connectivity,
+        "corner_cutting": corner_cutting,
+        "components": component_labels(prepared, connectivity, corner_cutting),
+        "tie_breaking": tie_breaking,
+        "queue": grid_queue(queue, prepared, heuristic, connectivity),
+    }
+
+    return run_batches(pairs, _search_task, (prepared, heuristic, options), workers, batch_size, stream)
@@ -0,0 +1,139 @@
+# benchmark2D.py
+import csv
+import random
+import time
+from heapq import heappush, heappop
+
+import numpy as np
+
+from astar2D import Node, astarh, get_neighbors, manhattan_heuristic
+from grid_engine import astar_array, astar_flat, prepare_grid
+from grid_generators import GENERATORS
+from plot_grid import generate_random_grid
+
+
+def astarh_scan(grid, start, goal, heuristic):
+    """
+    Versione precedente di astarh, con la scansione lineare della open list per i duplicati.
+    Tenuta solo come riferimento per il benchmark.
+    """
+    goal_node = Node(goal)
+    open_list = [(0, Node(start))]
+    closed_set = set()
+
+    while open_list:
+        _, current = heappop(open_list)
+        if current == goal_node:
+            path = []
+            while current:
+                path.append(current.position)
+                current = current.parent
+            return path[::-1], {"nodi_espansi": len(closed_set)}
+
+        closed_set.add(current.position)
+
+        for neighbor in get_neighbors(current, grid):
+            if neighbor.position in closed_set:
+                continue
+            neighbor.g = current.g + 1
+            neighbor.h = heuristic(neighbor.position, goal)
+            neighbor.f = neighbor.g + neighbor.h
+            if any(n.position == neighbor.position and n.f <= neighbor.f for _, n in open_list):
+                continue
+            heappush(open_list, (neighbor.f, neighbor))
+
+    return None, {"nodi_espansi": len(closed_set)}
+
+
+def run_open_list_benchmark(filename="benchmark_open_list.csv", sizes=(50, 100, 200, 300),
+                            obstacle_prob=0.2, heuristic=manhattan_heuristic, seed=0, scan_max_size=300):
+    """
+    Confronta la open list con scansione lineare (astarh_scan) con quella indicizzata
+    (astarh, astar_array) su griglie di dimensione crescente.
+
+    :param sizes: lati delle griglie quadrate
+    :param scan_max_size: oltre questo lato la versione lineare non viene eseguita
+    """
+    engines = {
+        "astarh_scan": astarh_scan,
+        "astarh": astarh,
+        "astar_array": astar_array,
+    }
+
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=[
+            "size", "engine", "success", "nodes_expanded", "time_sec", "us_per_expansion"
+        ])
+        writer.writeheader()
+
+        for size in sizes:
+            random.seed(seed + size)
+            grid = generate_random_grid(size, size, obstacle_prob)
+            start, goal = (0, 0), (size - 1, size - 1)
+            grid[start[0]][start[1]] = 0
+            grid[goal[0]][goal[1]] = 0
+
+            for name, func in engines.items():
+                if name == "astarh_scan" and size > scan_max_size:
+                    continue
+                t0 = time.perf_counter()
+                path, stats = func(grid, start, goal, heuristic)
+                t1 = time.perf_counter()
+
+                expanded = stats["nodi_espansi"]
+                writer.writerow({
+                    "size": size,
+                    "engine": name,
+                    "success": "yes" if path else "no",
+                    "nodes_expanded": expanded,
+                    "time_sec": round(t1 - t0, 6),
+                    "us_per_expansion": round((t1 - t0) * 1e6 / max(expanded, 1), 3)
+                })
+                print(f" {size}x{size} | {name:12s} → {t1 - t0:.4f} s, {expanded} nodi espansi")
+
+
+def run_queue_benchmark(filename="benchmark_queues.csv", sizes=(100, 300, 600), generators=("uniform", "cave"),
+                        max_cost=9, heuristic=manhattan_heuristic, seed=0, queues=("heap", "dial", "radix")):
+    """
+    Confronta heapq con le code a bucket di bucket_queue2D (Dial e radix) in astar_flat,
+    su griglie a costo unitario e su terreno con costi interi 1..max_cost.
+    Il tempo esclude prepare_grid; a parità di f le code a bucket estraggono nello stesso
+    ordine di heapq, quindi cambiano solo i tempi, non i nodi espansi.
+    """
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=[
+            "size", "generator", "terrain", "queue", "success", "nodes_expanded", "path_cost",
+            "time_sec", "us_per_expansion"
+        ])
+        writer.writeheader()
+
+        for size in sizes:
+            start, goal = (0, 0), (size - 1, size - 1)
+            for generator in generators:
+                grid = GENERATORS[generator](size, size, seed=seed + size, connect=(start, goal))
+                rng = np.random.default_rng(seed + size)
+                terrain = np.where(grid == 0, rng.integers(1, max_cost + 1, size=grid.shape), 0)
+
+                for name, prepared in (("unit", prepare_grid(grid)), ("integer", prepare_grid(terrain, True))):
+                    for queue in queues:
+                        t0 = time.perf_counter()
+                        path, stats = astar_flat(prepared, start, goal, heuristic, queue=queue)
+                        t1 = time.perf_counter()
+
+                        expanded = stats["nodi_espansi"]
+                        writer.writerow({
+                            "size": size,
+                            "generator": generator,
+                            "terrain": name,
+                            "queue": queue,
+                            "success": "yes" if path else "no",
+                            "nodes_expanded": expanded,
+                            "path_cost": stats["path_cost"],
+                            "time_sec": round(t1 - t0, 6),
+                            "us_per_expansion": round((t1 - t0) * 1e6 / max(expanded, 1), 3)
+                        })
+                        print(f" {size}x{size} {generator} {name} | {queue:5s} → {t1 - t0:.4f} s, {expanded} nodi espansi")
+
+
+if __name__ == "__main__":
+    run_open_list_benchmark()
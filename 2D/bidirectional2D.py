@@ -0,0 +1,130 @@
+# bidirectional2D.py
+# A* bidirezionale (NBA*, Pijls & Post) sulla griglia di grid_engine.
+# Due ricerche front-to-end, una dallo start verso il goal e una dal goal verso lo start,
+# con un insieme comune di nodi chiusi; L è il costo del miglior percorso trovato finora.
+# Un nodo estratto viene scartato senza espanderlo se g + h >= L oppure se
+# g + F_altro - h_altro >= L (F_altro = minimo f nella open list dell'altra direzione).
+# Serve un'euristica consistente (manhattan con 4-conn, octile con 8-conn).
+from array import array
+from heapq import heappush, heappop
+
+from astar2D import tie_breaking_weights
+from grid_engine import INF, CORNER_CUTTING, flatten_grid, terrain_costs, grid_moves
+
+
+def bidirectional_astar(grid, start, goal, heuristic, connectivity=4, corner_cutting="never", weighted=False,
+                        tie_breaking="fifo"):
+    """
+    Stessi parametri e stesso (path, stats) di astar_array; le statistiche riportano anche
+    i nodi espansi in ciascuna direzione (nodes_expanded_forward / nodes_expanded_backward).
+
+    :param tie_breaking: ordine tra celle con lo stesso f in ciascuna direzione (astar2D.TIE_BREAKING)
+    """
+    if corner_cutting not in CORNER_CUTTING:
+        raise ValueError("corner_cutting non valido: usa 'never', 'partial' o 'always'")
+    moves = grid_moves(connectivity)
+    tie_h, tie_g, tie_count = tie_breaking_weights(tie_breaking)
+    blocked, rows, cols = flatten_grid(grid, weighted)
+    costs = terrain_costs(grid) if weighted else None
+    n = rows * cols
+
+    start_idx = start[0] * cols + start[1]
+    goal_idx = goal[0] * cols + goal[1]
+    targets = (goal, start)
+
+    # indice 0 = avanti (start -> goal), 1 = indietro (goal -> start)
+    g_score = (array("d", [INF]) * n, array("d", [INF]) * n)
+    parent = (array("i", [-1]) * n, array("i", [-1]) * n)
+    closed = bytearray(n)
+    open_lists = ([], [])
+    expanded = [0, 0]
+    nodes_generated = 0
+    open_list_max = 1
+
+    for side, idx, pos in ((0, start_idx, start), (1, goal_idx, goal)):
+        g_score[side][idx] = 0
+        h = heuristic(pos, targets[side])
+        open_lists[side].append((h, tie_h * h, 0, idx))
+    best_f = [open_lists[0][0][0], open_lists[1][0][0]]
+
+    best_cost = INF  # L
+    meeting = -1
+    if start_idx == goal_idx:
+        best_cost, meeting = 0, start_idx
+
+    while open_lists[0] and open_lists[1]:
+        side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+        other = 1 - side
+        open_list = open_lists[side]
+        g_side, g_other = g_score[side], g_score[other]
+
+        f, _, _, current = heappop(open_list)
+        if not closed[current]:
+            closed[current] = 1
+            x, y = divmod(current, cols)
+            current_g = g_side[current]
+
+            if (f < best_cost
+                    and current_g + best_f[other] - heuristic((x, y), targets[other]) < best_cost):
+                expanded[side] += 1
+                for dx, dy, step in moves:
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < rows and 0 <= ny < cols):
+                        continue
+                    neighbor = nx * cols + ny
+                    if blocked[neighbor] or closed[neighbor]:
+                        continue
+                    if dx and dy and corner_cutting != "always":
+                        side_a = blocked[x * cols + ny]
+                        side_b = blocked[nx * cols + y]
+                        if (side_a or side_b) if corner_cutting == "never" else (side_a and side_b):
+                            continue
+
+                    # all'indietro si percorre l'arco neighbor -> current, che costa come la cella current
+                    if costs is None:
+                        cost = step
+                    else:
+                        cost = step * costs[neighbor if side == 0 else current]
+                    new_g = current_g + cost
+                    if new_g >= g_side[neighbor]:
+                        continue
+
+                    g_side[neighbor] = new_g
+                    parent[side][neighbor] = current
+                    nh = heuristic((nx, ny), targets[side])
+                    nodes_generated += 1
+                    heappush(open_list, (new_g + nh, tie_h * nh + tie_g * new_g, tie_count * nodes_generated, neighbor))
+                    if len(open_list) > open_list_max:
+                        open_list_max = len(open_list)
+
+                    if new_g + g_other[neighbor] < best_cost:
+                        best_cost = new_g + g_other[neighbor]
+                        meeting = neighbor
+
+        if open_list:
+            best_f[side] = open_list[0][0]
+
+    stats = {
+        "nodi_espansi": expanded[0] + expanded[1],
+        "nodes_expanded_forward": expanded[0],
+        "nodes_expanded_backward": expanded[1],
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+    }
+    if meeting == -1:
+        stats.update({"lunghezza_percorso": 0, "path_cost": 0})
+        return None, stats
+
+    path = []
+    idx = meeting
+    while idx != -1:
+        path.append(divmod(idx, cols))
+        idx = parent[0][idx]
+    path.reverse()
+    idx = parent[1][meeting]
+    while idx != -1:
+        path.append(divmod(idx, cols))
+        idx = parent[1][idx]
+
+    stats.update({"lunghezza_percorso": len(path), "path_cost": best_cost})
+    return path, stats
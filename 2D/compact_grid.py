@@ -0,0 +1,118 @@
+# compact_grid.py
+# Griglie compatte per mappe molto grandi:
+# - "bit":   mappe di ostacoli, 1 bit per cella (1 = ostacolo), righe impacchettate a byte;
+# - "uint8": terreno, 1 byte per cella (stessa codifica di astar_array con weighted=True, 0 = ostacolo).
+# Su disco: header di 16 byte seguito dai dati grezzi, così open_compact_grid può mapparli
+# in memoria (np.memmap) senza leggerli: l'apertura richiede millisecondi a prescindere dalla dimensione.
+import struct
+from array import array
+
+import numpy as np
+
+MAGIC = b"AGRD"
+HEADER = struct.Struct("<4sB3xII")  # magic, bit per cella, padding, rows, cols
+KINDS = {"bit": 1, "uint8": 8}
+CHUNK_CELLS = 1 << 20  # celle convertite per blocco in flat_blocked
+
+
+class CompactGrid:
+    """
+    Griglia compatta. Si comporta come una lista di righe (len(grid), grid[r][c]),
+    quindi funziona anche con astar/astarh e con plot_grid; grid_engine la riconosce
+    e legge direttamente gli array (flat_blocked / flat_costs).
+    """
+
+    def __init__(self, data, rows, cols, kind="bit"):
+        if kind not in KINDS:
+            raise ValueError("Tipo di griglia non valido: usa 'bit' o 'uint8'")
+        self.data = data  # bit: (rows, ceil(cols / 8)) uint8 impacchettato; uint8: (rows, cols)
+        self.rows = rows
+        self.cols = cols
+        self.kind = kind
+
+    @classmethod
+    def from_numpy(cls, values, kind="bit"):
+        values = np.asarray(values)
+        rows, cols = values.shape
+        if kind == "bit":
+            data = np.packbits(values != 0, axis=1)
+        else:
+            data = np.ascontiguousarray(values, dtype=np.uint8)
+        return cls(data, rows, cols, kind)
+
+    @classmethod
+    def from_list(cls, grid, kind="bit"):
+        return cls.from_numpy(np.array(grid), kind)
+
+    def to_numpy(self):
+        """Griglia completa come array uint8 (rows, cols)."""
+        if self.kind == "bit":
+            return np.unpackbits(self.data, axis=1, count=self.cols)
+        return np.asarray(self.data)
+
+    def to_list(self):
+        return self.to_numpy().tolist()
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        if self.kind == "bit":
+            return np.unpackbits(self.data[r], count=self.cols)
+        return self.data[r]
+
+    def __iter__(self):
+        for r in range(self.rows):
+            yield self[r]
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def flat_blocked(self, weighted=False):
+        """
+        Ostacoli come bytearray piatto (r * cols + c), il formato di flatten_grid.
+        Il risultato occupa comunque un byte per cella (8 volte i dati di una griglia "bit"):
+        si riempie un blocco di CHUNK_CELLS celle alla volta, senza altre copie complete della griglia.
+        """
+        if self.kind == "bit" and weighted:
+            raise ValueError("Una griglia 'bit' non ha costi: usa weighted=False")
+        blocked = bytearray(self.rows * self.cols)
+        view = np.frombuffer(blocked, dtype=np.uint8).reshape(self.rows, self.cols)
+        step = max(1, CHUNK_CELLS // max(self.cols, 1))
+        for r in range(0, self.rows, step):
+            chunk = self.data[r:r + step]
+            if self.kind == "bit":
+                view[r:r + step] = np.unpackbits(chunk, axis=1, count=self.cols)
+            else:
+                view[r:r + step] = (chunk == 0) if weighted else (chunk != 0)
+        return blocked
+
+    def flat_costs(self):
+        """Costi di ingresso come array double piatto, il formato di terrain_costs."""
+        if self.kind == "bit":
+            raise ValueError("Una griglia 'bit' non ha costi: usa weighted=False")
+        costs = array("d")
+        costs.frombytes(np.asarray(self.data, dtype=np.float64).tobytes())
+        return costs
+
+    def save(self, filename):
+        with open(filename, "wb") as file:
+            file.write(HEADER.pack(MAGIC, KINDS[self.kind], self.rows, self.cols))
+            file.write(np.ascontiguousarray(self.data).tobytes())
+
+
+def open_compact_grid(filename, mode="r"):
+    """
+    Apre una griglia salvata con CompactGrid.save mappandola in memoria.
+
+    :param mode: modalità di np.memmap ("r" sola lettura, "r+" per modificare il file)
+    """
+    with open(filename, "rb") as file:
+        magic, bits, rows, cols = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{filename} non è una griglia compatta")
+    kind = "bit" if bits == 1 else "uint8"
+    shape = (rows, (cols + 7) // 8) if kind == "bit" else (rows, cols)
+    data = np.memmap(filename, dtype=np.uint8, mode=mode, offset=HEADER.size, shape=shape)
+    return CompactGrid(data, rows, cols, kind)
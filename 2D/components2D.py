@@ -0,0 +1,109 @@
+# components2D.py
+# Etichette delle componenti connesse delle celle libere, calcolate una volta per griglia.
+# Due celle sono collegate solo se hanno la stessa etichetta: una query tra componenti
+# diverse si risolve in O(1) invece di esplorare tutta la regione raggiungibile dallo start.
+# Il chiamante calcola le etichette una volta per griglia e passa il ComponentLabels alle ricerche
+# (astar_flat, ida_star, sma_star con components=...): rifarle, o anche solo riconoscere la griglia
+# con un'impronta degli ostacoli, costa O(celle) a ogni query.
+from array import array
+
+# etichette per (versione della griglia scelta dal chiamante, diagonali)
+MAX_CACHED = 8
+_label_cache = {}
+
+
+class ComponentLabels:
+    """
+    labels[r * cols + c] è l'etichetta della cella (0..count-1), -1 per gli ostacoli.
+    """
+
+    def __init__(self, labels, cols, count):
+        self.labels = labels
+        self.cols = cols
+        self.count = count
+
+    def label(self, position):
+        return self.labels[position[0] * self.cols + position[1]]
+
+    def connected(self, start, goal):
+        """False se non esiste alcun percorso (o start/goal sono ostacoli)."""
+        a = self.label(start)
+        return a != -1 and a == self.label(goal)
+
+
+def unreachable_result(queue="heap"):
+    """
+    (path, stats) di una query scartata dalle etichette, con gli stessi campi di astar_array.
+
+    :param queue: coda richiesta dal chiamante, riportata in stats così com'è (nessuna ricerca, "auto" non viene risolto)
+    """
+    return None, {
+        "nodi_espansi": 0,
+        "lunghezza_percorso": 0,
+        "nodes_generated": 0,
+        "open_list_max": 0,
+        "path_cost": 0,
+        "queue": queue
+    }
+
+
+def needs_diagonals(connectivity=4, corner_cutting="never"):
+    # con "never" e "partial" ogni diagonale ha una cella ortogonale libera accanto,
+    # quindi le componenti sono le stesse della griglia 4-connessa
+    return connectivity == 8 and corner_cutting == "always"
+
+
+def label_components(blocked, rows, cols, diagonals=False):
+    """
+    Visita in profondità (con uno stack esplicito) di tutte le celle libere, una componente alla volta:
+    l'ordine di visita non conta, solo quali celle ricevono l'etichetta.
+
+    :param blocked: ostacoli piatti come in flatten_grid
+    :param diagonals: se True anche le diagonali collegano le celle (corner_cutting="always")
+    :return: ComponentLabels
+    """
+    labels = array("i", [-1]) * (rows * cols)
+    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    if diagonals:
+        moves += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    count = 0
+
+    for seed in range(rows * cols):
+        if blocked[seed] or labels[seed] != -1:
+            continue
+        labels[seed] = count
+        frontier = [seed]
+        while frontier:
+            u = frontier.pop()
+            x, y = divmod(u, cols)
+            for dx, dy in moves:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < rows and 0 <= ny < cols:
+                    v = nx * cols + ny
+                    if labels[v] == -1 and not blocked[v]:
+                        labels[v] = count
+                        frontier.append(v)
+        count += 1
+
+    return ComponentLabels(labels, cols, count)
+
+
+def component_labels(prepared, connectivity=4, corner_cutting="never", version=None):
+    """
+    Etichette per una griglia di prepare_grid, da tenere e riusare finché gli ostacoli non cambiano.
+
+    :param version: identificativo della griglia scelto dal chiamante (va cambiato a ogni modifica degli
+                    ostacoli); con una versione le etichette restano anche in una piccola cache,
+                    con None vengono solo calcolate
+    """
+    blocked, _, rows, cols = prepared
+    diagonals = needs_diagonals(connectivity, corner_cutting)
+    if version is None:
+        return label_components(blocked, rows, cols, diagonals)
+    key = (version, rows, cols, diagonals)
+
+    if key not in _label_cache:
+        if len(_label_cache) >= MAX_CACHED:
+            _label_cache.pop(next(iter(_label_cache)))
+        _label_cache[key] = label_components(blocked, rows, cols, diagonals)
+    return _label_cache[key]
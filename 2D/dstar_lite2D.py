@@ -0,0 +1,200 @@
+# dstar_lite2D.py
+# D* Lite (Koenig & Likhachev, versione ottimizzata) sulla griglia 4-connessa di grid_engine.
+# La ricerca parte dal goal: g[s] è il costo da s al goal e rhs[s] la sua stima a un passo.
+# Dopo una modifica di celle si aggiornano solo i vertici toccati e la ricerca ripara
+# l'albero esistente invece di ripartire da zero.
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+from grid_engine import INF, DIRECTIONS, prepare_grid, astar_array
+
+
+class DStarLite:
+    """
+    Pianificatore incrementale.
+
+    :param grid: griglia come per astar_array (0/1 oppure terreno pesato con weighted=True)
+    :param heuristic: euristica consistente, es. manhattan_heuristic
+    """
+
+    def __init__(self, grid, start, goal, heuristic, weighted=False):
+        self.blocked, self.costs, self.rows, self.cols = prepare_grid(grid, weighted)
+        self.weighted = weighted
+        self.heuristic = heuristic
+        self.start = start
+        self.goal = goal
+        self.km = 0
+        self.last_start = start
+
+        n = self.rows * self.cols
+        self.g = array("d", [INF]) * n
+        self.rhs = array("d", [INF]) * n
+        self.queue = []
+        self.queued = {}  # indice -> chiave corrente; le voci dello heap diverse sono obsolete
+        self.expanded = 0
+        self.total_expanded = 0
+
+        goal_idx = self._index(goal)
+        self.rhs[goal_idx] = 0
+        self._push(goal_idx)
+
+    def _index(self, position):
+        return position[0] * self.cols + position[1]
+
+    def _neighbors(self, idx):
+        x, y = divmod(idx, self.cols)
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.rows and 0 <= ny < self.cols:
+                yield nx * self.cols + ny
+
+    def _cost(self, u, v):
+        # costo dell'arco u -> v: ingresso nella cella v
+        if self.blocked[u] or self.blocked[v]:
+            return INF
+        return self.costs[v] if self.costs is not None else 1
+
+    def _key(self, idx):
+        best = min(self.g[idx], self.rhs[idx])
+        return best + self.heuristic(self.start, divmod(idx, self.cols)) + self.km, best
+
+    def _push(self, idx):
+        key = self._key(idx)
+        self.queued[idx] = key
+        heappush(self.queue, (key[0], key[1], idx))
+
+    def _top(self):
+        # scarta le voci obsolete in cima allo heap
+        while self.queue:
+            k1, k2, idx = self.queue[0]
+            if self.queued.get(idx) == (k1, k2):
+                return (k1, k2), idx
+            heappop(self.queue)
+        return (INF, INF), -1
+
+    def _update_vertex(self, idx):
+        if idx != self._index(self.goal):
+            best = INF
+            for succ in self._neighbors(idx):
+                cost = self._cost(idx, succ)
+                if cost != INF and cost + self.g[succ] < best:
+                    best = cost + self.g[succ]
+            self.rhs[idx] = best
+        self.queued.pop(idx, None)
+        if self.g[idx] != self.rhs[idx]:
+            self._push(idx)
+
+    def _compute_shortest_path(self):
+        start_idx = self._index(self.start)
+        while True:
+            top_key, u = self._top()
+            if u == -1:
+                break
+            if not (top_key < self._key(start_idx) or self.rhs[start_idx] != self.g[start_idx]):
+                break
+
+            new_key = self._key(u)
+            if top_key < new_key:
+                self._push(u)
+            elif self.g[u] > self.rhs[u]:
+                self.g[u] = self.rhs[u]
+                self.queued.pop(u, None)
+                self.expanded += 1
+                for pred in self._neighbors(u):
+                    self._update_vertex(pred)
+            else:
+                self.g[u] = INF
+                self.expanded += 1
+                self._update_vertex(u)
+                for pred in self._neighbors(u):
+                    self._update_vertex(pred)
+
+    def plan(self):
+        """
+        Calcola (o ripara) il percorso ottimo dallo start corrente.
+
+        :return: (path, stats) come astar_array; nodi_espansi conta solo il lavoro di questa chiamata,
+                 total_expanded quello accumulato da quando il pianificatore esiste
+        """
+        self.expanded = 0
+        self._compute_shortest_path()
+        self.total_expanded += self.expanded
+
+        start_idx = self._index(self.start)
+        stats = {
+            "nodi_espansi": self.expanded,
+            "total_expanded": self.total_expanded,
+            "open_list_size": len(self.queued),
+        }
+        if self.g[start_idx] == INF:
+            stats.update({"lunghezza_percorso": 0, "path_cost": 0})
+            return None, stats
+
+        path = [self.start]
+        goal_idx = self._index(self.goal)
+        idx = start_idx
+        while idx != goal_idx:
+            idx = min(self._neighbors(idx), key=lambda s, u=idx: self._cost(u, s) + self.g[s])
+            path.append(divmod(idx, self.cols))
+
+        stats.update({"lunghezza_percorso": len(path), "path_cost": self.g[start_idx]})
+        return path, stats
+
+    def update_cells(self, changes):
+        """
+        Applica un lotto di modifiche alla griglia; il prossimo plan() ripara la ricerca.
+
+        :param changes: iterabile di ((r, c), nuovo_valore), con la stessa codifica della griglia
+        """
+        touched = set()
+        for (r, c), value in changes:
+            idx = r * self.cols + c
+            self.blocked[idx] = (value <= 0) if self.weighted else (value != 0)
+            if self.costs is not None:
+                self.costs[idx] = value
+            touched.add(idx)
+            touched.update(self._neighbors(idx))
+        for idx in touched:
+            self._update_vertex(idx)
+
+    def move_start(self, new_start):
+        """Sposta lo start (l'agente si è mosso lungo il percorso) senza invalidare la ricerca."""
+        self.km += self.heuristic(self.last_start, new_start)
+        self.last_start = new_start
+        self.start = new_start
+
+
+def compare_replanning(grid, start, goal, heuristic, change_batches, weighted=False):
+    """
+    Confronta i nodi espansi da D* Lite nel riparare il percorso dopo ogni lotto di modifiche
+    con quelli di astar_array rilanciato da zero sulla griglia modificata.
+
+    :param grid: lista di liste, array NumPy o CompactGrid; non viene modificata
+    :param change_batches: lista di lotti, ciascuno come per DStarLite.update_cells
+    :return: una riga (dict) per il piano iniziale e per ogni lotto
+    """
+    # copia modificabile come array NumPy, che astar_array accetta direttamente;
+    # double con il terreno pesato perché i nuovi costi possono non essere interi
+    values = grid.to_numpy() if hasattr(grid, "to_numpy") else grid
+    grid = np.array(values, dtype=np.float64 if weighted else None)
+    planner = DStarLite(grid, start, goal, heuristic, weighted)
+    rows = []
+
+    for batch, changes in enumerate([[]] + list(change_batches)):
+        for (r, c), value in changes:
+            grid[r, c] = value
+        planner.update_cells(changes)
+        path, stats = planner.plan()
+        scratch_path, scratch_stats = astar_array(grid, start, goal, heuristic, weighted=weighted)
+        rows.append({
+            "batch": batch,
+            "changed_cells": len(changes),
+            "success": "yes" if path else "no",
+            "path_cost": stats["path_cost"],
+            "repaired_expanded": stats["nodi_espansi"],
+            "scratch_expanded": scratch_stats["nodi_espansi"],
+            "scratch_path_cost": scratch_stats["path_cost"],
+        })
+    return rows
@@ -0,0 +1,161 @@
+# flow_field2D.py
+# Campo di distanze verso un goal fisso (Dijkstra all'indietro dal goal) sulla griglia di grid_engine.
+# Calcolato una volta, serve tutte le unità dirette allo stesso goal:
+# - distance(cella) è il costo minimo fino al goal;
+# - next_step(cella) è la cella successiva lungo un percorso ottimo;
+# - il campo stesso è un'euristica perfetta per astarh/astar_array verso quel goal.
+# Il FlowField restituito va tenuto dal chiamante finché la griglia non cambia.
+from array import array
+from heapq import heappush, heappop
+
+from grid_engine import INF, CORNER_CUTTING, grid_moves, prepare_grid
+
+MAX_CACHED = 16
+_field_cache = {}
+
+
+class FlowField:
+    """
+    Distanze verso goal: dist[r * cols + c], INF per ostacoli e celle da cui il goal non si raggiunge.
+    Usabile direttamente come euristica: field(a, b) restituisce la distanza di a (b deve essere il goal).
+    """
+
+    def __init__(self, prepared, goal, dist, moves, corner_cutting):
+        self.prepared = prepared
+        self.goal = goal
+        self.dist = dist
+        self.moves = moves
+        self.corner_cutting = corner_cutting
+        self.rows, self.cols = prepared[2], prepared[3]
+
+    def distance(self, cell):
+        return self.dist[cell[0] * self.cols + cell[1]]
+
+    def __call__(self, a, b):
+        return self.dist[a[0] * self.cols + a[1]]
+
+    def next_step(self, cell):
+        """Vicino che minimizza costo della mossa + distanza; None sul goal o se il goal non è raggiungibile."""
+        blocked, costs, rows, cols = self.prepared
+        x, y = cell
+        best, best_cell = self.distance(cell), None
+        if best == INF or cell == self.goal:
+            return None
+        for dx, dy, step in self.moves:
+            nx, ny = x + dx, y + dy
+            if not _can_move(blocked, rows, cols, x, y, nx, ny, self.corner_cutting):
+                continue
+            v = nx * cols + ny
+            total = (step * costs[v] if costs is not None else step) + self.dist[v]
+            if total <= best + 1e-9:
+                best, best_cell = total, (nx, ny)
+        return best_cell
+
+    def path(self, start):
+        """Percorso da start al goal seguendo next_step; None se il goal non è raggiungibile."""
+        if self.distance(start) == INF:
+            return None
+        path = [start]
+        cell = self.next_step(start)
+        while cell is not None:
+            path.append(cell)
+            cell = self.next_step(cell)
+        return path
+
+
+def _can_move(blocked, rows, cols, x, y, nx, ny, corner_cutting):
+    # stessa regola di astar_flat per la mossa (x, y) -> (nx, ny)
+    if not (0 <= nx < rows and 0 <= ny < cols) or blocked[nx * cols + ny]:
+        return False
+    if x != nx and y != ny and corner_cutting != "always":
+        side_a = blocked[x * cols + ny]
+        side_b = blocked[nx * cols + y]
+        return not (side_a or side_b) if corner_cutting == "never" else not (side_a and side_b)
+    return True
+
+
+def distance_field(prepared, goal, connectivity=4, corner_cutting="never"):
+    """
+    Dijkstra dal goal sugli archi invertiti: la mossa u -> v costa step * costo[v],
+    quindi dal nodo v si aggiorna u con dist[v] + step * costo[v].
+    Con costo uniforme e 4-connessione basta una BFS.
+
+    :param prepared: griglia di prepare_grid
+    :return: FlowField
+    """
+    if corner_cutting not in CORNER_CUTTING:
+        raise ValueError("corner_cutting non valido: usa 'never', 'partial' o 'always'")
+    moves = grid_moves(connectivity)
+    blocked, costs, rows, cols = prepared
+    dist = array("d", [INF]) * (rows * cols)
+    goal_idx = goal[0] * cols + goal[1]
+    if blocked[goal_idx]:
+        return FlowField(prepared, goal, dist, moves, corner_cutting)
+    dist[goal_idx] = 0
+
+    if costs is None and connectivity == 4:
+        frontier = [goal_idx]
+        d = 0
+        while frontier:
+            d += 1
+            next_frontier = []
+            for v in frontier:
+                x, y = divmod(v, cols)
+                for dx, dy, _ in moves:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < rows and 0 <= ny < cols:
+                        u = nx * cols + ny
+                        if dist[u] == INF and not blocked[u]:
+                            dist[u] = d
+                            next_frontier.append(u)
+            frontier = next_frontier
+        return FlowField(prepared, goal, dist, moves, corner_cutting)
+
+    heap = [(0, goal_idx)]
+    while heap:
+        d, v = heappop(heap)
+        if d > dist[v]:
+            continue  # voce superata
+        x, y = divmod(v, cols)
+        enter = costs[v] if costs is not None else 1
+        for dx, dy, step in moves:
+            nx, ny = x - dx, y - dy  # predecessore u da cui la mossa (dx, dy) arriva in v
+            if not (0 <= nx < rows and 0 <= ny < cols) or blocked[nx * cols + ny]:
+                continue
+            if not _can_move(blocked, rows, cols, nx, ny, x, y, corner_cutting):
+                continue
+            u = nx * cols + ny
+            nd = d + step * enter
+            if nd < dist[u]:
+                dist[u] = nd
+                heappush(heap, (nd, u))
+    return FlowField(prepared, goal, dist, moves, corner_cutting)
+
+
+def _is_prepared(grid):
+    # (blocked, costs, rows, cols) di prepare_grid; una griglia come tupla di righe ha righe al posto di blocked
+    return (isinstance(grid, tuple) and len(grid) == 4 and isinstance(grid[0], bytearray)
+            and isinstance(grid[2], int) and isinstance(grid[3], int))
+
+
+def flow_field(grid, goal, weighted=False, connectivity=4, corner_cutting="never", version=None):
+    """
+    Come distance_field, ma con cache per (versione della griglia, goal, mosse) quando il chiamante
+    dà una versione: riconoscere la griglia dal contenuto costerebbe O(celle) a ogni chiamata.
+
+    :param grid: griglia come per astar_array (anche una tupla di righe), oppure già passata per prepare_grid;
+                 in quel caso weighted viene da prepare_grid e il parametro è ignorato
+    :param version: identificativo della griglia scelto dal chiamante (va cambiato a ogni modifica);
+                    con None il campo viene solo calcolato, senza cache
+    """
+    prepared = grid if _is_prepared(grid) else prepare_grid(grid, weighted)
+    weighted = prepared[1] is not None
+    if version is None:
+        return distance_field(prepared, goal, connectivity, corner_cutting)
+    key = (version, tuple(goal), weighted, connectivity, corner_cutting)
+
+    if key not in _field_cache:
+        if len(_field_cache) >= MAX_CACHED:
+            _field_cache.pop(next(iter(_field_cache)))
+        _field_cache[key] = distance_field(prepared, goal, connectivity, corner_cutting)
+    return _field_cache[key]
@@ -0,0 +1,281 @@
+# grid_engine.py
+# A* su griglia con stato indicizzato per cella (indice piatto r * cols + c)
+# e array tipizzati preallocati al posto degli oggetti Node.
+import math
+from array import array
+
+from astar2D import HEURISTIC_KERNELS, KERNEL_SUM, KERNEL_SQRT, KERNEL_OCTILE, heuristic_kernel, tie_breaking_weights
+from bucket_queue2D import make_queue, select_queue
+from components2D import unreachable_result
+from tracing import POP, EXPAND, PUSH, GOAL
+
+INF = float("inf")
+
+# stesso ordine di get_neighbors in astar2D
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIAGONALS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+SQRT2 = math.sqrt(2)
+
+# politiche per le mosse diagonali rispetto alle due celle ortogonali adiacenti
+CORNER_CUTTING = ("never", "partial", "always")
+
+
+def flatten_grid(grid, weighted=False):
+    """
+    Converte la griglia (lista di liste) in un bytearray piatto di ostacoli.
+    Con weighted=False: 0 = libero, qualsiasi altro valore = ostacolo.
+    Con weighted=True: il valore è il costo di ingresso nella cella, <= 0 = non attraversabile.
+    Accetta anche una CompactGrid (compact_grid.py) o un array NumPy (grid_generators.py),
+    senza passare per le liste.
+
+    :param grid: griglia rows x cols
+    :return: (blocked, rows, cols) con blocked[r * cols + c] != 0 se la cella è un ostacolo
+    """
+    if hasattr(grid, "flat_blocked"):  # CompactGrid
+        return grid.flat_blocked(weighted), grid.rows, grid.cols
+    if hasattr(grid, "shape"):  # array NumPy
+        rows, cols = grid.shape
+        return bytearray(((grid <= 0) if weighted else (grid != 0)).astype("uint8").tobytes()), rows, cols
+    rows, cols = len(grid), len(grid[0])
+    if weighted:
+        blocked = bytearray(1 if v <= 0 else 0 for row in grid for v in row)
+    else:
+        blocked = bytearray(1 if v else 0 for row in grid for v in row)
+    return blocked, rows, cols
+
+
+def terrain_costs(grid):
+    """Costi di ingresso per cella, stesso indice piatto di flatten_grid."""
+    if hasattr(grid, "flat_costs"):
+        return grid.flat_costs()
+    if hasattr(grid, "shape"):
+        costs = array("d")
+        costs.frombytes(grid.astype("float64").tobytes())
+        return costs
+    return array("d", (v for row in grid for v in row))
+
+
+def grid_moves(connectivity=4):
+    """Mosse (dx, dy, lunghezza del passo) per connettività 4 o 8."""
+    if connectivity == 4:
+        return [(dx, dy, 1) for dx, dy in DIRECTIONS]
+    if connectivity == 8:
+        return [(dx, dy, 1) for dx, dy in DIRECTIONS] + [(dx, dy, SQRT2) for dx, dy in DIAGONALS]
+    raise ValueError("Connettività non valida: usa 4 o 8")
+
+
+def prepare_grid(grid, weighted=False):
+    """
+    Conversione della griglia da fare una volta sola per più query.
+
+    :return: (blocked, costs, rows, cols), costs è None se weighted=False
+    """
+    blocked, rows, cols = flatten_grid(grid, weighted)
+    costs = terrain_costs(grid) if weighted else None
+    return blocked, costs, rows, cols
+
+
+def integer_costs(prepared):
+    """
+    :return: (True se tutti i costi di ingresso sono interi, costo massimo); senza costi (True, 1)
+    """
+    costs = prepared[1]
+    if costs is None or not costs:
+        return True, 1
+    # gli ostacoli hanno costo <= 0: il massimo è comunque quello di una cella libera
+    return all(map(float.is_integer, costs)), max(max(costs), 1)
+
+
+def grid_queue(queue, prepared, heuristic, connectivity=4):
+    """
+    Coda per astar_flat: con queue="auto" le code a bucket quando f è sempre intera,
+    cioè 4-connessione, costi interi ed euristica nulla o manhattan (consistente con costi >= 1).
+    """
+    if queue != "auto":
+        return select_queue(queue, True, 1)
+    if connectivity != 4 or HEURISTIC_KERNELS.get(heuristic) not in ("zero", "manhattan"):
+        return "heap"
+    integer_keys, max_cost = integer_costs(prepared)
+    return select_queue(queue, integer_keys, max_cost)
+
+
+class SearchBuffers:
+    """
+    Array di ricerca riutilizzabili tra query sulla stessa griglia.
+    g_score e direction valgono solo se visited[i] == epoch, la cella è chiusa se closed[i] == epoch:
+    reset() incrementa l'epoca e invalida tutto in O(1) senza riscrivere gli array.
+    Al posto dell'indice del padre (4 byte) si salva l'indice della mossa che ha raggiunto
+    la cella (0..7, un byte): il padre è la cella a distanza -(dx, dy).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.g_score = array("d", [INF]) * size
+        self.direction = bytearray(size)
+        self.visited = array("I", [0]) * size
+        self.closed = array("I", [0]) * size
+        self.epoch = 0
+
+    def reset(self):
+        self.epoch += 1
+        if self.epoch > 0xFFFFFFFF:  # overflow del contatore: si azzera davvero
+            self.visited = array("I", [0]) * self.size
+            self.closed = array("I", [0]) * self.size
+            self.epoch = 1
+        return self.epoch
+
+
+def reconstruct_path(direction, start_idx, goal_idx, cols, moves):
+    """
+    Risale dal goal allo start togliendo a ogni cella lo spostamento della mossa salvata.
+
+    :param moves: le stesse mosse (dx, dy, ...) usate nella ricerca, nell'ordine di grid_moves
+    """
+    offsets = [move[0] * cols + move[1] for move in moves]
+    path = []
+    idx = goal_idx
+    while idx != start_idx:
+        path.append(divmod(idx, cols))
+        idx -= offsets[direction[idx]]
+    path.append(divmod(start_idx, cols))
+    return path[::-1]
+
+
+def astar_array(grid, start, goal, heuristic, trace=None, connectivity=4, corner_cutting="never", weighted=False,
+                tie_breaking="fifo", queue="heap"):
+    """
+    A* equivalente ad astarh, ma con g-score, parent e closed in array preallocati
+    indicizzati per cella. Restituisce lo stesso (path, stats) di astarh, più path_cost.
+    trace è un sink opzionale di tracing.py.
+
+    :param connectivity: 4 oppure 8 (diagonali di costo sqrt(2))
+    :param corner_cutting: per le diagonali, "never" richiede libere entrambe le celle ortogonali,
+                           "partial" almeno una, "always" nessuna
+    :param weighted: se True i valori della griglia sono costi di ingresso (terreno), <= 0 = ostacolo;
+                     il costo di una mossa è lunghezza del passo * costo della cella di arrivo.
+                     Con costi >= 1 manhattan (4-conn) e octile (8-conn) restano ammissibili.
+    :param tie_breaking: ordine tra celle con lo stesso f (astar2D.TIE_BREAKING), di default fifo come astarh;
+                         le code a bucket estraggono a parità di f nello stesso ordine di heapq
+    :param queue: open list, una tra bucket_queue2D.QUEUES, di default heapq; "auto" sceglie Dial
+                  o radix quando f è sempre intera (vedi grid_queue), ma con il terreno pesato
+                  scorre tutti i costi della griglia a ogni chiamata
+    """
+    return astar_flat(prepare_grid(grid, weighted), start, goal, heuristic, trace=trace,
+                      connectivity=connectivity, corner_cutting=corner_cutting, tie_breaking=tie_breaking,
+                      queue=queue)
+
+
+def astar_flat(prepared, start, goal, heuristic, trace=None, connectivity=4, corner_cutting="never", buffers=None,
+               components=None, tie_breaking="fifo", queue="heap"):
+    """
+    Come astar_array, ma su una griglia già passata per prepare_grid e, opzionalmente,
+    con dei SearchBuffers riutilizzati tra una query e l'altra.
+    Con components (ComponentLabels di components2D.component_labels) una query tra
+    componenti diverse restituisce subito None senza cercare.
+    Per usare le code a bucket su molte query conviene risolvere "auto" una volta con
+    grid_queue e passare il nome (come fa batch2D.astar_many), invece di queue="auto" a ogni query.
+    """
+    if corner_cutting not in CORNER_CUTTING:
+        raise ValueError("corner_cutting non valido: usa 'never', 'partial' o 'always'")
+    if components is not None and not components.connected(start, goal):
+        return unreachable_result(queue)
+    moves = grid_moves(connectivity)
+    blocked, costs, rows, cols = prepared
+    if buffers is None:
+        buffers = SearchBuffers(rows * cols)
+    epoch = buffers.reset()
+    g_score, direction, visited, closed = buffers.g_score, buffers.direction, buffers.visited, buffers.closed
+
+    start_idx = start[0] * cols + start[1]
+    goal_idx = goal[0] * cols + goal[1]
+
+    g_score[start_idx] = 0
+    visited[start_idx] = epoch
+    kernel, hx, hy = heuristic_kernel(heuristic, goal, rows, cols)
+    tie_h, tie_g, tie_count = tie_breaking_weights(tie_breaking)
+    queue = grid_queue(queue, prepared, heuristic, connectivity)
+
+    # voci (f, tie-breaking, contatore, indice), come in astar2D
+    start_h = heuristic(start, goal)
+    _, push, pop = make_queue(queue)
+    push((start_h, 0, 0, start_idx))
+    expanded = 0
+    nodes_generated = 0
+    open_size = 1  # voci in coda, contate qui invece di chiamare len() a ogni passo
+    open_list_max = 1
+
+    while open_size:
+        f, _, _, current = pop()
+        open_size -= 1
+        if closed[current] == epoch:
+            continue  # voce superata da un g migliore
+        # solo ora g_score[current] è il g di questa voce: le voci obsolete non sono POP
+        if trace is not None:
+            trace(POP, divmod(current, cols), g_score[current], f - g_score[current], f)
+
+        if current == goal_idx:
+            if trace is not None:
+                trace(GOAL, goal, g_score[current], f - g_score[current], f)
+            path = reconstruct_path(direction, start_idx, goal_idx, cols, moves)
+            return path, {
+                "nodi_espansi": expanded,
+                "lunghezza_percorso": len(path),
+                "nodes_generated": nodes_generated,
+                "open_list_max": open_list_max,
+                "path_cost": g_score[goal_idx],
+                "queue": queue
+            }
+
+        closed[current] = epoch
+        expanded += 1
+
+        x, y = divmod(current, cols)
+        if trace is not None:
+            trace(EXPAND, (x, y), g_score[current], f - g_score[current], f)
+        current_g = g_score[current]
+
+        for code, (dx, dy, step) in enumerate(moves):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < rows and 0 <= ny < cols):
+                continue
+            neighbor = nx * cols + ny
+            if blocked[neighbor] or closed[neighbor] == epoch:
+                continue
+            if dx and dy and corner_cutting != "always":
+                side_a = blocked[x * cols + ny]
+                side_b = blocked[nx * cols + y]
+                if (side_a or side_b) if corner_cutting == "never" else (side_a and side_b):
+                    continue
+
+            new_g = current_g + (step * costs[neighbor] if costs is not None else step)
+            if visited[neighbor] == epoch and new_g >= g_score[neighbor]:
+                continue
+
+            visited[neighbor] = epoch
+            g_score[neighbor] = new_g
+            direction[neighbor] = code
+            if kernel == KERNEL_SUM:
+                h = hx[nx] + hy[ny]
+            elif kernel == KERNEL_SQRT:
+                h = math.sqrt(hx[nx] + hy[ny])
+            elif kernel == KERNEL_OCTILE:
+                hdx, hdy = hx[nx], hy[ny]
+                h = hdx + hdy + (SQRT2 - 2) * (hdx if hdx < hdy else hdy)
+            else:
+                h = heuristic((nx, ny), goal)
+            nodes_generated += 1
+            push((new_g + h, tie_h * h + tie_g * new_g, tie_count * nodes_generated, neighbor))
+            if trace is not None:
+                trace(PUSH, (nx, ny), new_g, h, new_g + h)
+            open_size += 1
+            if open_size > open_list_max:
+                open_list_max = open_size
+
+    return None, {
+        "nodi_espansi": expanded,
+        "lunghezza_percorso": 0,
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+        "path_cost": 0,
+        "queue": queue
+    }
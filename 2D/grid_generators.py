@@ -0,0 +1,131 @@
+# grid_generators.py
+# Generatori di griglie vettorizzati con NumPy (0 = libero, 1 = ostacolo, dtype uint8).
+# Ogni generatore usa un proprio np.random.Generator creato dal seed passato, quindi
+# lo stesso seed produce sempre la stessa griglia e lo stato globale di random non conta.
+# Con connect=(start, goal) si scava un percorso a scala monotono tra start e goal:
+# la connettività è garantita per costruzione, senza rigenerare la griglia.
+import numpy as np
+
+CHUNK_ROWS = 1024  # righe generate per blocco, limita la memoria temporanea
+
+
+def carve_path(grid, start, goal, rng):
+    """
+    Libera un percorso 4-connesso da start a goal fatto di passi verso il goal in ordine casuale.
+    """
+    (r0, c0), (r1, c1) = start, goal
+    dr = 1 if r1 >= r0 else -1
+    dc = 1 if c1 >= c0 else -1
+    steps = np.zeros(abs(r1 - r0) + abs(c1 - c0), dtype=bool)
+    steps[:abs(r1 - r0)] = True  # True = passo verticale
+    rng.shuffle(steps)
+    rows_path = r0 + dr * np.concatenate(([0], np.cumsum(steps)))
+    cols_path = c0 + dc * np.concatenate(([0], np.cumsum(~steps)))
+    grid[rows_path, cols_path] = 0
+    return grid
+
+
+def _finish(grid, rng, connect):
+    if connect is not None:
+        carve_path(grid, connect[0], connect[1], rng)
+    return grid
+
+
+def uniform_grid(rows, cols, obstacle_prob=0.2, seed=None, connect=None):
+    """
+    Rumore uniforme, come generate_random_grid. La probabilità è quantizzata a 1/256
+    (si confrontano byte casuali con una soglia).
+    """
+    rng = np.random.default_rng(seed)
+    threshold = int(round(obstacle_prob * 256))
+    grid = np.empty((rows, cols), dtype=np.uint8)
+    for r in range(0, rows, CHUNK_ROWS):
+        block = min(CHUNK_ROWS, rows - r)
+        noise = np.frombuffer(rng.bytes(block * cols), dtype=np.uint8).reshape(block, cols)
+        np.less(noise, threshold, out=grid[r:r + block], casting="unsafe")
+    return _finish(grid, rng, connect)
+
+
+def _wall_neighbors(grid):
+    # numero di ostacoli tra gli 8 vicini, il bordo conta come ostacolo
+    padded = np.pad(grid, 1, constant_values=1)
+    rows, cols = grid.shape
+    count = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr != 1 or dc != 1:
+                count += padded[dr:dr + rows, dc:dc + cols]
+    return count
+
+
+def cave_grid(rows, cols, fill_prob=0.45, steps=4, birth=5, survive=4, seed=None, connect=None):
+    """
+    Caverne con automa cellulare: si parte da rumore uniforme e a ogni passo una cella
+    diventa ostacolo se ha almeno birth vicini ostacolo (survive se lo era già).
+    """
+    rng = np.random.default_rng(seed)
+    grid = uniform_grid(rows, cols, fill_prob, seed=rng)
+    for _ in range(steps):
+        walls = _wall_neighbors(grid)
+        grid = ((walls >= birth) | ((grid == 1) & (walls >= survive))).astype(np.uint8)
+    return _finish(grid, rng, connect)
+
+
+def maze_grid(rows, cols, seed=None, connect=None):
+    """
+    Labirinto perfetto con l'algoritmo "binary tree": le celle stanno alle coordinate dispari
+    e ognuna apre il muro verso nord oppure verso est. Tutte le celle sono collegate;
+    connect conviene passarlo con start e goal su coordinate dispari.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.ones((rows, cols), dtype=np.uint8)
+    n_r, n_c = (rows - 1) // 2, (cols - 1) // 2
+    if n_r == 0 or n_c == 0:
+        return _finish(grid, rng, connect)
+    cells = grid[1:2 * n_r:2, 1:2 * n_c:2]      # viste sulla griglia, niente indici espliciti
+    north_walls = grid[0:2 * n_r - 1:2, 1:2 * n_c:2]
+    east_walls = grid[1:2 * n_r:2, 2:2 * n_c + 1:2]
+    cells[:] = 0
+
+    north = rng.random((n_r, n_c), dtype=np.float32) < 0.5
+    north[0, :] = False            # prima riga: solo est
+    north[:, -1] = True            # ultima colonna: solo nord
+    north[0, -1] = False
+    east = ~north
+    east[0, -1] = False            # cella in alto a destra: radice dell'albero
+
+    north_walls[north] = 0
+    east_walls[east] = 0
+    return _finish(grid, rng, connect)
+
+
+def rooms_grid(rows, cols, n_rooms=20, room_min=4, room_max=12, seed=None, connect=None):
+    """
+    Stanze rettangolari su fondo pieno, collegate in sequenza (ordinate per centro)
+    da corridoi a L: tutte le stanze sono raggiungibili.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.ones((rows, cols), dtype=np.uint8)
+    heights = rng.integers(room_min, room_max + 1, n_rooms).clip(max=rows)
+    widths = rng.integers(room_min, room_max + 1, n_rooms).clip(max=cols)
+    tops = rng.integers(0, rows - heights + 1)
+    lefts = rng.integers(0, cols - widths + 1)
+
+    centers = []
+    for top, left, h, w in zip(tops, lefts, heights, widths):
+        grid[top:top + h, left:left + w] = 0
+        centers.append((int(top + h // 2), int(left + w // 2)))
+
+    centers.sort()
+    for (r0, c0), (r1, c1) in zip(centers, centers[1:]):
+        grid[min(r0, r1):max(r0, r1) + 1, c0] = 0
+        grid[r1, min(c0, c1):max(c0, c1) + 1] = 0
+    return _finish(grid, rng, connect)
+
+
+GENERATORS = {
+    "uniform": uniform_grid,
+    "cave": cave_grid,
+    "maze": maze_grid,
+    "rooms": rooms_grid,
+}
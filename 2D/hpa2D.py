@@ -0,0 +1,338 @@
+# hpa2D.py
+# HPA* (Botea et al.) sulla griglia di grid_engine, 4-connessa, con o senza terreno pesato.
+# - la griglia è divisa in cluster cluster_size x cluster_size;
+# - sui bordi tra cluster adiacenti ogni tratto libero diventa uno o due ingressi
+#   (al centro se il tratto è corto, agli estremi se è lungo);
+# - dentro ogni cluster si calcolano una volta le distanze tra gli ingressi.
+# La query inserisce start e goal nel grafo astratto, cerca lì con A* e raffina
+# il percorso cella per cella solo quando richiesto. Il risultato è quasi ottimo:
+# i percorsi passano sempre per gli ingressi.
+import hashlib
+import os
+import pickle
+from heapq import heappush, heappop
+
+from grid_engine import INF, DIRECTIONS, prepare_grid
+
+LONG_ENTRANCE = 6  # tratti di bordo almeno così lunghi producono due ingressi
+
+
+def _cluster_of(idx, cols, cluster_size):
+    x, y = divmod(idx, cols)
+    return x // cluster_size, y // cluster_size
+
+
+def _cluster_bounds(cluster, rows, cols, cluster_size):
+    cr, cc = cluster
+    return (cr * cluster_size, min((cr + 1) * cluster_size, rows),
+            cc * cluster_size, min((cc + 1) * cluster_size, cols))
+
+
+def _cluster_dijkstra(prepared, bounds, source, targets=None, reverse=False):
+    """
+    Dijkstra limitato al rettangolo bounds = (r0, r1, c0, c1).
+    Con reverse=True calcola le distanze verso source invece che da source.
+    Si ferma quando tutti i targets sono stati chiusi.
+
+    :return: (dist, parent, espansi)
+    """
+    blocked, costs, rows, cols = prepared
+    if costs is None:
+        return _cluster_bfs(blocked, cols, bounds, source, targets)
+    r0, r1, c0, c1 = bounds
+    dist = {source: 0}
+    parent = {source: -1}
+    done = set()
+    remaining = set(targets) if targets is not None else None
+    heap = [(0, source)]
+
+    while heap:
+        d, u = heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+
+        x, y = divmod(u, cols)
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if not (r0 <= nx < r1 and c0 <= ny < c1):
+                continue
+            v = nx * cols + ny
+            if blocked[v] or v in done:
+                continue
+            nd = d + costs[u if reverse else v]
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                parent[v] = u
+                heappush(heap, (nd, v))
+
+    return dist, parent, len(done)
+
+
+def _cluster_bfs(blocked, cols, bounds, source, targets=None):
+    # costo unitario: una BFS basta ed è simmetrica, reverse non serve
+    r0, r1, c0, c1 = bounds
+    dist = {source: 0}
+    parent = {source: -1}
+    remaining = set(targets) if targets is not None else None
+    if remaining is not None:
+        remaining.discard(source)
+    frontier = [source]
+    d = 0
+
+    while frontier and (remaining is None or remaining):
+        d += 1
+        next_frontier = []
+        for u in frontier:
+            x, y = divmod(u, cols)
+            for v, inside in ((u - cols, x > r0), (u + cols, x < r1 - 1), (u - 1, y > c0), (u + 1, y < c1 - 1)):
+                if inside and v not in dist and not blocked[v]:
+                    dist[v] = d
+                    parent[v] = u
+                    next_frontier.append(v)
+                    if remaining is not None:
+                        remaining.discard(v)
+        frontier = next_frontier
+
+    return dist, parent, len(dist)
+
+
+def grid_key(prepared, cluster_size):
+    """Impronta della griglia usata per riconoscere un'astrazione salvata."""
+    blocked, costs, rows, cols = prepared
+    digest = hashlib.sha1(blocked)
+    if costs is not None:
+        digest.update(costs.tobytes())
+    digest.update(f"{rows}x{cols}:{cluster_size}".encode())
+    return digest.hexdigest()
+
+
+def build_abstraction(grid, cluster_size=10, weighted=False):
+    """
+    Costruisce il grafo astratto di HPA*.
+
+    :return: dizionario con la griglia preparata, i nodi astratti (indice piatto -> cluster),
+             gli archi astratti {nodo: [(nodo, costo), ...]} e i nodi di ogni cluster
+    """
+    prepared = prepare_grid(grid, weighted)
+    blocked, costs, rows, cols = prepared
+    nodes = {}
+    edges = {}
+
+    def add_transition(a, b):
+        for u, v in ((a, b), (b, a)):
+            nodes.setdefault(u, _cluster_of(u, cols, cluster_size))
+            edges.setdefault(u, []).append((v, 1 if costs is None else costs[v]))
+
+    def add_border(cells):
+        # cells: coppie (a, b) lungo il bordo, a e b adiacenti in cluster diversi
+        run = []
+        for a, b in cells + [(None, None)]:
+            if a is not None and not blocked[a] and not blocked[b]:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) >= LONG_ENTRANCE:
+                    add_transition(*run[0])
+                    add_transition(*run[-1])
+                else:
+                    add_transition(*run[len(run) // 2])
+                run = []
+
+    for border in range(cluster_size, cols, cluster_size):  # bordi verticali
+        for r0 in range(0, rows, cluster_size):
+            add_border([(r * cols + border - 1, r * cols + border) for r in range(r0, min(r0 + cluster_size, rows))])
+    for border in range(cluster_size, rows, cluster_size):  # bordi orizzontali
+        for c0 in range(0, cols, cluster_size):
+            add_border([((border - 1) * cols + c, border * cols + c) for c in range(c0, min(c0 + cluster_size, cols))])
+
+    cluster_nodes = {}
+    for node, cluster in nodes.items():
+        cluster_nodes.setdefault(cluster, []).append(node)
+
+    # archi intra-cluster: distanze esatte tra gli ingressi dello stesso cluster.
+    # Lungo lo stesso percorso il costo inverso differisce solo per le celle estreme
+    # (cost(b -> a) = cost(a -> b) - costo[b] + costo[a]), quindi basta una ricerca per coppia.
+    for cluster, members in cluster_nodes.items():
+        bounds = _cluster_bounds(cluster, rows, cols, cluster_size)
+        for i, node in enumerate(members[:-1]):
+            others = members[i + 1:]
+            dist, _, _ = _cluster_dijkstra(prepared, bounds, node, targets=others)
+            for other in others:
+                if other in dist:
+                    back = dist[other] if costs is None else dist[other] - costs[other] + costs[node]
+                    edges[node].append((other, dist[other]))
+                    edges[other].append((node, back))
+
+    return {
+        "key": grid_key(prepared, cluster_size),
+        "cluster_size": cluster_size,
+        "prepared": prepared,
+        "nodes": nodes,
+        "edges": edges,
+        "cluster_nodes": cluster_nodes,
+    }
+
+
+def save_abstraction(abstraction, filename):
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(filename, "wb") as file:
+        pickle.dump(abstraction, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_abstraction(filename):
+    with open(filename, "rb") as file:
+        return pickle.load(file)
+
+
+def load_or_build_abstraction(grid, cluster_size=10, weighted=False, cache_dir="cache/hpa"):
+    """
+    Riusa l'astrazione salvata in cache_dir se la griglia è la stessa, altrimenti la costruisce e la salva.
+    """
+    key = grid_key(prepare_grid(grid, weighted), cluster_size)
+    filename = os.path.join(cache_dir, f"hpa_{key}.pkl")
+    if os.path.exists(filename):
+        return load_abstraction(filename)
+    abstraction = build_abstraction(grid, cluster_size, weighted)
+    save_abstraction(abstraction, filename)
+    return abstraction
+
+
+def _local_edges(abstraction, cell, reverse=False, also=None):
+    """
+    Archi temporanei tra cell e gli ingressi del suo cluster (verso cell se reverse=True).
+
+    :param also: cella in più da chiudere nella stessa ricerca (il goal nello stesso cluster),
+                 così la sua distanza in dist è definitiva anche se il cluster non ha ingressi
+    """
+    prepared = abstraction["prepared"]
+    rows, cols = prepared[2], prepared[3]
+    cluster_size = abstraction["cluster_size"]
+    cluster = _cluster_of(cell, cols, cluster_size)
+    members = abstraction["cluster_nodes"].get(cluster, [])
+    bounds = _cluster_bounds(cluster, rows, cols, cluster_size)
+    targets = members if also is None else members + [also]
+    dist, _, expanded = _cluster_dijkstra(prepared, bounds, cell, targets=targets, reverse=reverse)
+    return [(node, dist[node]) for node in members if node != cell and node in dist], dist, expanded
+
+
+def hpa_star_abstract(abstraction, start, goal, heuristic):
+    """
+    Cerca sul grafo astratto senza raffinare.
+
+    :return: (lista di indici piatti dei nodi astratti da start a goal oppure None, stats)
+    """
+    blocked, costs, rows, cols = abstraction["prepared"]
+    edges = abstraction["edges"]
+    start_idx = start[0] * cols + start[1]
+    goal_idx = goal[0] * cols + goal[1]
+
+    cluster_size = abstraction["cluster_size"]
+    same_cluster = _cluster_of(start_idx, cols, cluster_size) == _cluster_of(goal_idx, cols, cluster_size)
+    start_edges, start_dist, local_expanded = _local_edges(abstraction, start_idx,
+                                                           also=goal_idx if same_cluster else None)
+    goal_edges, _, goal_expanded = _local_edges(abstraction, goal_idx, reverse=True)
+    local_expanded += goal_expanded
+
+    extra = {start_idx: list(start_edges)}
+    for node, cost in goal_edges:
+        extra.setdefault(node, []).append((goal_idx, cost))
+    if same_cluster and goal_idx in start_dist:  # collegamento diretto dentro il cluster
+        extra[start_idx].append((goal_idx, start_dist[goal_idx]))
+
+    def h(idx):
+        return heuristic(divmod(idx, cols), goal)
+
+    g_score = {start_idx: 0}
+    parent = {start_idx: -1}
+    closed = set()
+    open_list = [(h(start_idx), start_idx)]
+    nodes_generated = 0
+    open_list_max = 1
+
+    while open_list:
+        _, current = heappop(open_list)
+        if current in closed:
+            continue
+        if current == goal_idx:
+            abstract_path = []
+            while current != -1:
+                abstract_path.append(current)
+                current = parent[current]
+            return abstract_path[::-1], {
+                "nodi_espansi": len(closed),
+                "local_expanded": local_expanded,
+                "nodes_generated": nodes_generated,
+                "open_list_max": open_list_max,
+                "path_cost": g_score[goal_idx]
+            }
+        closed.add(current)
+
+        for neighbor, cost in edges.get(current, []) + extra.get(current, []):
+            if neighbor in closed:
+                continue
+            new_g = g_score[current] + cost
+            if new_g >= g_score.get(neighbor, INF):
+                continue
+            g_score[neighbor] = new_g
+            parent[neighbor] = current
+            heappush(open_list, (new_g + h(neighbor), neighbor))
+            nodes_generated += 1
+            open_list_max = max(open_list_max, len(open_list))
+
+    return None, {
+        "nodi_espansi": len(closed),
+        "local_expanded": local_expanded,
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+        "path_cost": 0
+    }
+
+
+def iter_refined_path(abstraction, abstract_path):
+    """
+    Generatore delle celle del percorso completo: ogni tratto astratto viene raffinato
+    (Dijkstra nel cluster) solo quando il consumatore ci arriva.
+    """
+    prepared = abstraction["prepared"]
+    rows, cols = prepared[2], prepared[3]
+    cluster_size = abstraction["cluster_size"]
+
+    yield divmod(abstract_path[0], cols)
+    for u, v in zip(abstract_path, abstract_path[1:]):
+        if _cluster_of(u, cols, cluster_size) != _cluster_of(v, cols, cluster_size):
+            yield divmod(v, cols)  # arco tra ingressi adiacenti
+            continue
+        bounds = _cluster_bounds(_cluster_of(u, cols, cluster_size), rows, cols, cluster_size)
+        _, parent, _ = _cluster_dijkstra(prepared, bounds, u, targets=[v])
+        segment = []
+        idx = v
+        while idx != u:
+            segment.append(idx)
+            idx = parent[idx]
+        for idx in reversed(segment):
+            yield divmod(idx, cols)
+
+
+def hpa_star(abstraction, start, goal, heuristic, refine=True):
+    """
+    Query HPA*, con lo stesso (path, stats) di astarh.
+    Con refine=False path è il generatore di iter_refined_path, da consumare quando serve,
+    e stats["lunghezza_percorso"] è None: la lunghezza si conosce solo dopo il raffinamento.
+    """
+    abstract_path, stats = hpa_star_abstract(abstraction, start, goal, heuristic)
+    stats["abstract_path_len"] = len(abstract_path) if abstract_path else 0
+    if abstract_path is None:
+        stats["lunghezza_percorso"] = 0
+        return None, stats
+
+    path = iter_refined_path(abstraction, abstract_path)
+    stats["lunghezza_percorso"] = None
+    if refine:
+        path = list(path)
+        stats["lunghezza_percorso"] = len(path)
+    return path, stats
@@ -0,0 +1,242 @@
+# jps2D.py
+# Jump Point Search su griglia 4-connessa a costo uniforme (0 = libero, 1 = ostacolo).
+#
+# Ordinamento canonico: i passi verticali vengono anticipati il più possibile.
+# - un nodo raggiunto in verticale prosegue in verticale e apre entrambe le direzioni orizzontali;
+# - un nodo raggiunto in orizzontale prosegue in orizzontale e gira in verticale solo
+#   se forzato, cioè se la cella sopra/sotto è libera e quella dietro di essa è un ostacolo.
+# La scansione verticale si ferma nelle celle da cui una scansione orizzontale trova
+# un jump point (come le diagonali nella JPS classica a 8 direzioni).
+from array import array
+from heapq import heappush, heappop
+
+from grid_engine import INF, DIRECTIONS, flatten_grid
+
+UP, DOWN, LEFT, RIGHT = range(4)  # indici in DIRECTIONS
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+
+def _forced(blocked, rows, cols, r, c, dc):
+    """Vero se arrivando in (r, c) con passo orizzontale dc si è forzati a girare in verticale."""
+    prev = c - dc
+    if r > 0 and not blocked[(r - 1) * cols + c] and blocked[(r - 1) * cols + prev]:
+        return True
+    if r < rows - 1 and not blocked[(r + 1) * cols + c] and blocked[(r + 1) * cols + prev]:
+        return True
+    return False
+
+
+def _jump_horizontal(blocked, rows, cols, r, c, dc, goal):
+    while True:
+        c += dc
+        if c < 0 or c >= cols or blocked[r * cols + c]:
+            return None
+        if (r, c) == goal or _forced(blocked, rows, cols, r, c, dc):
+            return r, c
+
+
+def _jump_vertical(blocked, rows, cols, r, c, dr, goal):
+    while True:
+        r += dr
+        if r < 0 or r >= rows or blocked[r * cols + c]:
+            return None
+        if (r, c) == goal:
+            return r, c
+        if (_jump_horizontal(blocked, rows, cols, r, c, 1, goal) is not None
+                or _jump_horizontal(blocked, rows, cols, r, c, -1, goal) is not None):
+            return r, c
+
+
+def _pruned_directions(blocked, rows, cols, r, c, parent):
+    """Direzioni da esplorare da (r, c) dato il jump point padre (None per lo start)."""
+    if parent is None:
+        return DIRECTIONS
+    pr, pc = parent
+    if pc == c:  # arrivato in verticale
+        dr = 1 if r > pr else -1
+        return [(dr, 0), (0, -1), (0, 1)]
+    dc = 1 if c > pc else -1
+    directions = [(0, dc)]
+    prev = c - dc
+    for dr in (-1, 1):
+        nr = r + dr
+        if 0 <= nr < rows and not blocked[nr * cols + c] and blocked[nr * cols + prev]:
+            directions.append((dr, 0))
+    return directions
+
+
+def expand_path(jump_points):
+    """Ricostruisce il percorso cella per cella a partire dai jump point (segmenti rettilinei)."""
+    path = [jump_points[0]]
+    for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        r, c = r0, c0
+        while (r, c) != (r1, c1):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+    return path
+
+
+def _search(blocked, rows, cols, start, goal, heuristic, successors):
+    """A* sui jump point; successors(r, c, parent) restituisce i jump point raggiungibili."""
+    n = rows * cols
+    g_score = array("d", [INF]) * n
+    parent = array("i", [-1]) * n
+    closed = bytearray(n)
+
+    start_idx = start[0] * cols + start[1]
+    goal_idx = goal[0] * cols + goal[1]
+    g_score[start_idx] = 0
+    start_h = heuristic(start, goal)
+    open_list = [(start_h, start_h, start_idx)]
+    expanded = 0
+    nodes_generated = 0
+    open_list_max = 1
+
+    while open_list:
+        _, _, current = heappop(open_list)
+        if closed[current]:
+            continue
+
+        if current == goal_idx:
+            jump_points = []
+            idx = current
+            while idx != -1:
+                jump_points.append(divmod(idx, cols))
+                idx = parent[idx]
+            path = expand_path(jump_points[::-1])
+            return path, {
+                "nodi_espansi": expanded,
+                "lunghezza_percorso": len(path),
+                "nodes_generated": nodes_generated,
+                "open_list_max": open_list_max
+            }
+
+        closed[current] = 1
+        expanded += 1
+
+        r, c = divmod(current, cols)
+        p = parent[current]
+        for nr, nc in successors(r, c, divmod(p, cols) if p != -1 else None):
+            neighbor = nr * cols + nc
+            if closed[neighbor]:
+                continue
+            new_g = g_score[current] + abs(nr - r) + abs(nc - c)
+            if new_g >= g_score[neighbor]:
+                continue
+
+            g_score[neighbor] = new_g
+            parent[neighbor] = current
+            h = heuristic((nr, nc), goal)
+            heappush(open_list, (new_g + h, h, neighbor))
+            nodes_generated += 1
+            if len(open_list) > open_list_max:
+                open_list_max = len(open_list)
+
+    return None, {
+        "nodi_espansi": expanded,
+        "lunghezza_percorso": 0,
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max
+    }
+
+
+def jps(grid, start, goal, heuristic):
+    """
+    Jump Point Search: stessa firma e stesso (path, stats) di astarh.
+    nodi_espansi conta i jump point espansi; il path restituito è completo, cella per cella.
+    """
+    blocked, rows, cols = flatten_grid(grid)
+
+    def successors(r, c, parent):
+        result = []
+        for dr, dc in _pruned_directions(blocked, rows, cols, r, c, parent):
+            if dr:
+                jp = _jump_vertical(blocked, rows, cols, r, c, dr, goal)
+            else:
+                jp = _jump_horizontal(blocked, rows, cols, r, c, dc, goal)
+            if jp is not None:
+                result.append(jp)
+        return result
+
+    return _search(blocked, rows, cols, start, goal, heuristic, successors)
+
+
+def precompute_jump_distances(grid):
+    """
+    Tabella JPS+: per ogni cella e direzione (ordine di DIRECTIONS) la distanza di salto.
+    Un valore k > 0 indica un jump point a k passi, k <= 0 indica -k passi liberi prima
+    di un ostacolo o del bordo. Il goal non entra nella tabella e viene gestito in query.
+
+    :return: (blocked, rows, cols, dist) da passare a jps_plus come jump_table
+    """
+    blocked, rows, cols = flatten_grid(grid)
+    dist = array("i", [0]) * (rows * cols * 4)
+
+    # orizzontale: dipende solo dalla riga
+    for r in range(rows):
+        base = r * cols
+        for d, dc, columns in ((RIGHT, 1, range(cols - 1, -1, -1)), (LEFT, -1, range(cols))):
+            for c in columns:
+                nc = c + dc
+                if nc < 0 or nc >= cols or blocked[base + nc]:
+                    value = 0
+                elif _forced(blocked, rows, cols, r, nc, dc):
+                    value = 1
+                else:
+                    value = dist[(base + nc) * 4 + d]
+                    value = value + 1 if value > 0 else value - 1
+                dist[(base + c) * 4 + d] = value
+
+    # verticale: ci si ferma nelle celle con un jump point orizzontale
+    for c in range(cols):
+        for d, dr, row_range in ((DOWN, 1, range(rows - 1, -1, -1)), (UP, -1, range(rows))):
+            for r in row_range:
+                nr = r + dr
+                if nr < 0 or nr >= rows or blocked[nr * cols + c]:
+                    value = 0
+                else:
+                    nidx = (nr * cols + c) * 4
+                    if dist[nidx + LEFT] > 0 or dist[nidx + RIGHT] > 0:
+                        value = 1
+                    else:
+                        value = dist[nidx + d]
+                        value = value + 1 if value > 0 else value - 1
+                dist[(r * cols + c) * 4 + d] = value
+
+    return blocked, rows, cols, dist
+
+
+def jps_plus(grid, start, goal, heuristic, jump_table=None):
+    """
+    JPS+: come jps, ma i salti sono letti dalla tabella di precompute_jump_distances.
+    Per più query sulla stessa griglia calcolare la tabella una volta e passarla come jump_table.
+    """
+    if jump_table is None:
+        jump_table = precompute_jump_distances(grid)
+    blocked, rows, cols, dist = jump_table
+    goal_r, goal_c = goal
+
+    def successors(r, c, parent):
+        result = []
+        base = (r * cols + c) * 4
+        for dr, dc in _pruned_directions(blocked, rows, cols, r, c, parent):
+            k = dist[base + DIRECTION_INDEX[(dr, dc)]]
+            reach = k if k > 0 else -k
+            if dr:
+                # il goal è sulla traiettoria: ci si ferma sulla sua riga
+                steps = (goal_r - r) * dr
+                if 0 < steps <= reach:
+                    result.append((goal_r, c))
+                elif k > 0:
+                    result.append((r + k * dr, c))
+            else:
+                steps = (goal_c - c) * dc
+                if goal_r == r and 0 < steps <= reach:
+                    result.append(goal)
+                elif k > 0:
+                    result.append((r, c + k * dc))
+        return result
+
+    return _search(blocked, rows, cols, start, goal, heuristic, successors)
@@ -54,6 +54,19 @@ from multipletest import multipletest, run_heuristic_experiment, run_non_heurist
 
 #run_experiments_csv("risultati_astar.csv", num_tests=50, size=(20, 20), obstacle_prob=0.25)
 #############################################################
+# HPA*: l'astrazione viene salvata in cache/hpa e riusata ai lanci successivi sulla stessa griglia
+# import random
+# from astar2D import manhattan_heuristic
+# from hpa2D import load_or_build_abstraction, hpa_star
+#
+# random.seed(42)
+# grid = generate_random_grid(1000, 1000, obstacle_prob=0.2)
+# start, goal = (0, 0), (999, 999)
+# grid[0][0] = grid[999][999] = 0
+# abstraction = load_or_build_abstraction(grid, cluster_size=20)
+# path, stats = hpa_star(abstraction, start, goal, manhattan_heuristic)
+# print(stats)
+#############################################################
 #run_heuristic_experiment("results_20x20.csv",10,(20,20),0.2)
 #run_heuristic_experiment(filename="results_50x50.csv", num_trials=5, grid_size=(50,50), obstacle_prob=0.2)
 #run_heuristic_experiment(filename="results_100x100.csv", num_trials=5, grid_size=(100,100), obstacle_prob=0.2)
@@ -0,0 +1,61 @@
+# memory_bounded2D.py
+# IDA* e SMA* sulla griglia di astarh. Le ricerche sono condivise con Grafi/: l'implementazione,
+# generica su una funzione successors(stato) -> [(vicino, costo), ...], è in common/memory_bounded.py;
+# qui gli adattatori per la griglia e il controllo delle componenti prima di cercare.
+import os
+import sys
+
+from components2D import component_labels, unreachable_result
+from grid_engine import prepare_grid
+
+_COMMON = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+if _COMMON not in sys.path:
+    sys.path.append(_COMMON)
+
+from memory_bounded import INF, SMANode, ida_star_search, sma_star_search  # noqa: E402
+
+
+def grid_successors(grid):
+    """Vicini 4-connessi liberi (0) con costo 1, come get_neighbors di astar2D."""
+    rows, cols = len(grid), len(grid[0])
+
+    def successors(position):
+        x, y = position
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < rows and 0 <= ny < cols and grid[nx][ny] == 0:
+                yield (nx, ny), 1
+
+    return successors
+
+
+def _unreachable(grid, start, goal, components):
+    # le etichette costano un intero per cella, molto meno dei Node di astarh
+    if components is None:
+        components = component_labels(prepare_grid(grid))
+    if components.connected(start, goal):
+        return None
+    path, stats = unreachable_result()
+    stats.update({"re_expansions": 0, "peak_stored_nodes": 0})
+    return path, stats
+
+
+def ida_star(grid, start, goal, heuristic, table_size=None, bound_growth=0.0, components=None):
+    """
+    IDA* sulla griglia di astarh; stats come astarh più re_expansions e peak_stored_nodes.
+
+    :param components: ComponentLabels della griglia (components2D.component_labels), da calcolare una
+                       volta per più query; con None vengono ricalcolate a ogni chiamata (O(celle))
+    """
+    result = _unreachable(grid, start, goal, components)
+    if result is not None:
+        return result
+    return ida_star_search(start, goal, grid_successors(grid), lambda p: heuristic(p, goal), table_size, bound_growth)
+
+
+def sma_star(grid, start, goal, heuristic, max_nodes=10000, components=None):
+    """SMA* sulla griglia di astarh con al più max_nodes nodi in memoria; components come in ida_star."""
+    result = _unreachable(grid, start, goal, components)
+    if result is not None:
+        return result
+    return sma_star_search(start, goal, grid_successors(grid), lambda p: heuristic(p, goal), max_nodes)
@@ -2,7 +2,11 @@ import csv
 import time
 from datetime import datetime
 
-from astar2D import astar, zero_heuristic, manhattan_heuristic, euclidean_heuristic, astarh, aggressive_manhattan
+from astar2D import astar, zero_heuristic, manhattan_heuristic, euclidean_heuristic, astarh, aggressive_manhattan, TIE_BREAKING
+from components2D import component_labels, unreachable_result
+from grid_engine import prepare_grid
+from jps2D import jps, jps_plus
+from grid_generators import GENERATORS
 from plot_grid import generate_random_grid, plot_grid, save_plot_grid
 
 
@@ -28,7 +32,15 @@ def multipletest():
             print(f"  {k}: {v}")
 
 
-def run_heuristic_experiment(filename="results_heuristics.csv", num_trials=10, grid_size=(20, 20), obstacle_prob=0.2):
+def run_heuristic_experiment(filename="results_heuristics.csv", num_trials=10, grid_size=(20, 20), obstacle_prob=0.2,
+                             algos=None, seed=None, generator="uniform"):
+    """
+    :param algos: dict {nome: funzione(grid, start, goal, heuristic)}, default solo A* (astarh).
+                  Es. {"astar": astarh, "jps": jps, "jps_plus": jps_plus}
+    :param seed: se indicato, il trial i usa la griglia di grid_generators con seed + i
+                 (riproducibile) e start/goal collegati per costruzione
+    :param generator: "uniform", "cave", "maze" o "rooms", usato solo con seed
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     rows, cols = grid_size
     heuristics = {
@@ -36,42 +48,57 @@ def run_heuristic_experiment(filename="results_heuristics.csv", num_trials=10, g
         "manhattan": manhattan_heuristic,
         "euclidean": euclidean_heuristic,
     }
+    if algos is None:
+        algos = {"astar": astarh}
 
     with open(filename, mode="w", newline="") as file:
         fieldnames = [
-            "trial", "heuristic", "success", "path_len", "nodes_expanded",
+            "trial", "seed", "algo", "heuristic", "success", "path_len", "nodes_expanded",
             "nodes_generated", "open_list_max", "time_sec"
         ]
         writer = csv.DictWriter(file, fieldnames=fieldnames)
         writer.writeheader()
 
         for trial in range(1, num_trials + 1):
-            grid = generate_random_grid(rows, cols, obstacle_prob)
             start = (0, 0)
             goal = (rows - 1, cols - 1)
+            trial_seed = seed + trial if seed is not None else ""
+            if seed is None:
+                grid = generate_random_grid(rows, cols, obstacle_prob)
+            elif generator == "uniform":
+                grid = GENERATORS[generator](rows, cols, obstacle_prob, seed=trial_seed, connect=(start, goal)).tolist()
+            else:
+                grid = GENERATORS[generator](rows, cols, seed=trial_seed, connect=(start, goal)).tolist()
             grid[start[0]][start[1]] = 0
             grid[goal[0]][goal[1]] = 0
+            # start e goal in componenti diverse: nessuna ricerca, "no" in O(1)
+            # (etichette calcolate una volta per griglia, non per algoritmo o euristica)
+            reachable = component_labels(prepare_grid(grid)).connected(start, goal)
 
 
-            for h_name, h_func in heuristics.items():
-                start_time = time.perf_counter()
-                path, stats = astarh(grid, start, goal, heuristic=h_func)
-                end_time = time.perf_counter()
-                save_plot_grid(grid, path, start, goal, trial, h_name, grid_size, timestamp)
+            for algo_name, search in algos.items():
+                for h_name, h_func in heuristics.items():
+                    start_time = time.perf_counter()
+                    path, stats = search(grid, start, goal, heuristic=h_func) if reachable else unreachable_result()
+                    end_time = time.perf_counter()
+                    label = h_name if algo_name == "astar" else f"{algo_name}_{h_name}"
+                    save_plot_grid(grid, path, start, goal, trial, label, grid_size, timestamp)
 
-                writer.writerow({
-                    "trial": trial,
-                    "heuristic": h_name,
-                    "success": "yes" if path else "no",
-                    "path_len": stats["lunghezza_percorso"],
-                    "nodes_expanded": stats["nodi_espansi"],
-                    "nodes_generated": stats["nodes_generated"],
-                    "open_list_max": stats["open_list_max"],
-                    "time_sec": round(end_time - start_time, 6)
+                    writer.writerow({
+                        "trial": trial,
+                        "seed": trial_seed,
+                        "algo": algo_name,
+                        "heuristic": h_name,
+                        "success": "yes" if path else "no",
+                        "path_len": stats["lunghezza_percorso"],
+                        "nodes_expanded": stats["nodi_espansi"],
+                        "nodes_generated": stats["nodes_generated"],
+                        "open_list_max": stats["open_list_max"],
+                        "time_sec": round(end_time - start_time, 6)
 
-                })
+                    })
 
-                print(f" Trial {trial} | {h_name} → {'Successo' if path else 'Fallito'}")
+                    print(f" Trial {trial} | {algo_name} | {h_name} → {'Successo' if path else 'Fallito'}")
 
 
 def run_non_heuristic_experiment(filename="results_heuristics.csv", num_trials=10, grid_size=(20, 20), obstacle_prob=0.2):
@@ -98,11 +125,12 @@ def run_non_heuristic_experiment(filename="results_heuristics.csv", num_trials=1
             goal = (rows - 1, cols - 1)
             grid[start[0]][start[1]] = 0
             grid[goal[0]][goal[1]] = 0
+            reachable = component_labels(prepare_grid(grid)).connected(start, goal)
 
 
             for h_name, h_func in heuristics.items():
                 start_time = time.perf_counter()
-                path, stats = astarh(grid, start, goal, heuristic=h_func)
+                path, stats = astarh(grid, start, goal, heuristic=h_func) if reachable else unreachable_result()
                 end_time = time.perf_counter()
                 save_plot_grid(grid, path, start, goal, trial, h_name, grid_size, timestamp)
 
@@ -118,4 +146,50 @@ def run_non_heuristic_experiment(filename="results_heuristics.csv", num_trials=1
 
                 })
 
-                print(f" Trial {trial} | {h_name} → {'Successo' if path else 'Fallito'}")
\ No newline at end of file
+                print(f" Trial {trial} | {h_name} → {'Successo' if path else 'Fallito'}")
+
+
+def run_tie_breaking_benchmark(filename="results_tie_breaking.csv", num_trials=10, grid_size=(100, 100),
+                               obstacle_prob=0.2, seed=0, heuristic=manhattan_heuristic, policies=None):
+    """
+    Nodi espansi da astarh con ogni politica di tie-breaking sulle stesse griglie (seed + trial).
+    Le griglie quasi libere sono il caso peggiore: lunghi plateau di nodi con lo stesso f.
+
+    :param policies: nomi di astar2D.TIE_BREAKING, default tutti
+    """
+    rows, cols = grid_size
+    if policies is None:
+        policies = list(TIE_BREAKING)
+
+    with open(filename, mode="w", newline="") as file:
+        fieldnames = [
+            "trial", "seed", "policy", "success", "path_len", "nodes_expanded",
+            "nodes_generated", "open_list_max", "time_sec"
+        ]
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for trial in range(1, num_trials + 1):
+            start = (0, 0)
+            goal = (rows - 1, cols - 1)
+            trial_seed = seed + trial
+            grid = GENERATORS["uniform"](rows, cols, obstacle_prob, seed=trial_seed, connect=(start, goal)).tolist()
+
+            for policy in policies:
+                start_time = time.perf_counter()
+                path, stats = astarh(grid, start, goal, heuristic, tie_breaking=policy)
+                end_time = time.perf_counter()
+
+                writer.writerow({
+                    "trial": trial,
+                    "seed": trial_seed,
+                    "policy": policy,
+                    "success": "yes" if path else "no",
+                    "path_len": stats["lunghezza_percorso"],
+                    "nodes_expanded": stats["nodi_espansi"],
+                    "nodes_generated": stats["nodes_generated"],
+                    "open_list_max": stats["open_list_max"],
+                    "time_sec": round(end_time - start_time, 6)
+                })
+
+                print(f" Trial {trial} | {policy} → espansi {stats['nodi_espansi']}")
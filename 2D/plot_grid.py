@@ -4,8 +4,16 @@ import random
 from matplotlib import pyplot as plt
 from datetime import datetime
 
+def copy_grid(grid):
+    # copia modificabile; una CompactGrid (anche mappata da file) o un array NumPy diventa un array float
+    if hasattr(grid, "to_numpy"):
+        return grid.to_numpy().astype(float)
+    if hasattr(grid, "astype"):
+        return grid.astype(float)
+    return [row[:] for row in grid]
+
 def plot_grid(grid, path, start, goal):
-    grid = [row[:] for row in grid]  # copia
+    grid = copy_grid(grid)  # copia
     if path:
         for x, y in path:
             if (x, y) != start and (x, y) != goal:
@@ -28,6 +36,13 @@ def generate_random_grid(rows, cols, obstacle_prob=0.2):
         for _ in range(rows)
     ]
 
+def generate_random_terrain(rows, cols, obstacle_prob=0.2, max_cost=10):
+    # terreno pesato per astar_array(weighted=True): 0 = ostacolo, 1..max_cost = costo della cella
+    return [
+        [0 if random.random() < obstacle_prob else random.randint(1, max_cost) for _ in range(cols)]
+        for _ in range(rows)
+    ]
+
 # def save_plot_grid(grid, path, start, goal, trial, heuristic, grid_size, timestamp, base_dir="plots"):
 #     rows, cols = grid_size
 #     subfolder = f"{rows}x{cols}_{timestamp}"
@@ -61,7 +76,7 @@ def save_plot_grid(grid, path, start, goal, trial, heuristic, grid_size, timesta
     save_dir = os.path.join(base_dir, subfolder)
     os.makedirs(save_dir, exist_ok=True)
 
-    grid_copy = [row[:] for row in grid]
+    grid_copy = copy_grid(grid)
 
     # Base map
     plt.figure(figsize=(6, 6))
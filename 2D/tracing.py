@@ -0,0 +1,78 @@
+# tracing.py
+# Sink per gli eventi delle ricerche su griglia (astar, astarh, astar_array).
+# Un sink è un qualsiasi callable sink(event, position, g, h, f); con trace=None
+# le ricerche non costruiscono né stampano nulla.
+# POP si registra solo per le voci valide: una voce obsoleta (cella già chiusa con un g migliore)
+# viene scartata senza eventi, quindi i POP corrispondono alle estrazioni effettive.
+import struct
+from collections import deque
+
+POP, EXPAND, PUSH, GOAL = 0, 1, 2, 3
+EVENT_NAMES = ("pop", "expand", "push", "goal")
+
+
+class PrintTrace:
+    """Stampa gli eventi come facevano le vecchie versioni di astar/astarh."""
+
+    def __call__(self, event, position, g, h, f):
+        if event == EXPAND:
+            print(f"[INFO] Espansione nodo: {position} | g={g} h={h} f={f}")
+        elif event == PUSH:
+            print(f"  ↳ Considero vicino: {position} | g={g} h={h} f={f}")
+        elif event == GOAL:
+            print(f"[INFO] Goal raggiunto: {position} | g={g}")
+
+
+class RingBufferTrace:
+    """Tiene in memoria solo gli ultimi maxlen eventi."""
+
+    def __init__(self, maxlen=10000):
+        self.events = deque(maxlen=maxlen)
+
+    def __call__(self, event, position, g, h, f):
+        self.events.append((event, position, g, h, f))
+
+    def __iter__(self):
+        return iter(self.events)
+
+
+class BinaryTraceFile:
+    """
+    Scrive gli eventi su file binario, un record a dimensione fissa per evento
+    (tipo evento, x, y, g, h, f). Si rilegge con read_trace.
+    """
+
+    RECORD = struct.Struct("<Biiddd")
+
+    def __init__(self, filename):
+        self.file = open(filename, "wb")
+
+    def __call__(self, event, position, g, h, f):
+        self.file.write(self.RECORD.pack(event, position[0], position[1], g, h, f))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(filename):
+    """Generatore sugli eventi salvati da BinaryTraceFile, nello stesso formato del sink."""
+    size = BinaryTraceFile.RECORD.size
+    with open(filename, "rb") as file:
+        while True:
+            chunk = file.read(size)
+            if len(chunk) < size:
+                break
+            event, x, y, g, h, f = BinaryTraceFile.RECORD.unpack(chunk)
+            yield event, (x, y), g, h, f
+
+
+def replay(events, sink):
+    """Ripassa una sequenza di eventi (ring buffer o read_trace) a un altro sink, es. PrintTrace()."""
+    for event in events:
+        sink(*event)
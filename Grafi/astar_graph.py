@@ -1,10 +1,17 @@
 import heapq
 import math
 import random
+import time
+from array import array
 
 import networkx as nx
 import matplotlib.pyplot as plt
 
+from bucket_queue_graph import make_queue, select_queue
+from csr_graph import CSRGraph
+
+INF = float("inf")
+
 class Node:
     def __init__(self, id, parent=None):
         self.id = id
@@ -28,57 +35,327 @@ def manhattan_heuristic(a, b):
 def euclidean_heuristic(a, b):
     return math.sqrt((a[0] - b[0])**2 + (a[1] - b[1])**2)
 
-def astar_graph(graph, start_id, goal_id, heuristic, pos=None):
-    start_node = Node(start_id)
-    goal_node = Node(goal_id)
+# euristiche predefinite che astar_graph calcola inline invece di chiamare la funzione per ogni vicino
+HEURISTIC_KERNELS = {
+    zero_heuristic: "zero",
+    manhattan_heuristic: "manhattan",
+    euclidean_heuristic: "euclidean",
+}
 
-    open_list = []
-    closed_set = set()
+# tie-breaking a parità di f: le voci dello heap sono (f, a * h + b * g, c * contatore, nodo)
+# con il contatore di inserimento sempre presente, così Node.__lt__ non viene mai chiamato
+TIE_BREAKING = {
+    "fifo": (0, 0, 1),     # il primo inserito
+    "lifo": (0, 0, -1),    # l'ultimo inserito
+    "low_h": (1, 0, 1),    # h minore, il più vicino al goal
+    "high_g": (0, -1, 1),  # g maggiore, il più lontano dallo start
+}
+
+
+def tie_breaking_weights(policy):
+    if policy not in TIE_BREAKING:
+        raise ValueError(f"tie_breaking non valido: usa uno tra {', '.join(TIE_BREAKING)}")
+    return TIE_BREAKING[policy]
+
+
+def integer_weights(edge_lists):
+    """
+    :param edge_lists: liste di adiacenza [(vicino, peso), ...], es. graph.values(), oppure un CSRGraph
+    :return: (True se tutti i pesi sono interi, peso massimo)
+    """
+    if isinstance(edge_lists, CSRGraph):
+        return edge_lists.integer_weights()  # sugli array, senza scorrere le righe
+    largest = 1
+    for edges in edge_lists:
+        for _, weight in edges:
+            if not float(weight).is_integer():
+                return False, largest
+            if weight > largest:
+                largest = weight
+    return True, largest
+
+
+def graph_queue(queue, edge_lists, kind, positions=None, epsilon=1.0):
+    """
+    Coda per astar_graph: con queue="auto" le code a bucket quando f è sempre intera, cioè pesi
+    interi ed euristica nulla, oppure manhattan su posizioni intere con epsilon = 1.
+    Con manhattan la consistenza non è garantita, quindi niente radix (chiavi non monotone).
+    Il controllo dei pesi è O(E): per molte query conviene risolverla una volta e passare il nome.
+    """
+    if queue != "auto":
+        return select_queue(queue, True, 1)
+    if kind == "zero":
+        monotone = True
+    elif (kind == "manhattan" and positions is not None and epsilon == 1
+          and all(float(x).is_integer() and float(y).is_integer() for x, y in positions)):
+        monotone = False
+    else:
+        return "heap"
+    integer_keys, max_cost = integer_weights(edge_lists)
+    return select_queue(queue, integer_keys, max_cost, monotone)
+
+
+class SearchTree:
+    """
+    Albero di ricerca di astar_graph dallo start: ids[i] è il nodo con indice locale i,
+    parent[i] l'indice del predecessore (-1 per lo start), dist[i] il suo g, settled[i] = 1
+    se il nodo è stato chiuso. Con euristica consistente ed epsilon = 1 il g di un nodo chiuso
+    è la distanza minima dallo start: una sola ricerca risponde a tutte le query start -> nodo chiuso.
+    """
+
+    def __init__(self, ids, slot, parent, dist, settled):
+        self.ids = ids
+        self.slot = slot
+        self.parent = parent
+        self.dist = dist
+        self.settled = settled
+
+    def is_settled(self, node):
+        i = self.slot.get(node)
+        return i is not None and self.settled[i] == 1
+
+    def distance(self, node):
+        """g del nodo se chiuso, altrimenti INF."""
+        return self.dist[self.slot[node]] if self.is_settled(node) else INF
+
+    def path(self, node):
+        """Percorso start -> node lungo i predecessori, None se il nodo non è chiuso."""
+        if not self.is_settled(node):
+            return None
+        path = []
+        i = self.slot[node]
+        while i != -1:
+            path.append(self.ids[i])
+            i = self.parent[i]
+        path.reverse()
+        return path
+
+
+def astar_graph(graph, start_id, goal_id, heuristic, pos=None, epsilon=1.0, tie_breaking="fifo", queue="heap",
+                return_tree=False):
+    """
+    Con epsilon > 1 è Weighted A* (f = g + epsilon * h): con euristica consistente il costo
+    trovato è al più epsilon volte l'ottimo (stats["suboptimality_bound"]).
 
-    heapq.heappush(open_list, (start_node.f, start_node))
+    :param graph: dizionario {nodo: [(vicino, peso), ...]} o CSRGraph (csr_graph.py);
+                  con un CSRGraph e pos=None si usano le sue coordinate, se presenti (non per
+                  le euristiche sugli id con node_ids = True, es. landmarks_graph.LandmarkHeuristic)
+    :param tie_breaking: ordine tra nodi con lo stesso f, una delle chiavi di TIE_BREAKING
+                         (le code a bucket estraggono a parità di f nello stesso ordine di heapq)
+    :param queue: open list, una tra bucket_queue_graph.QUEUES, di default heapq; "auto" sceglie
+                  Dial o radix quando f è sempre intera (vedi graph_queue), ma scorre tutti gli
+                  archi a ogni chiamata: per molte query va risolta una volta con graph_queue
+    :param return_tree: se True stats["search_tree"] è il SearchTree della ricerca (anche se il goal
+                        non è raggiungibile), per rispondere ad altre query dallo stesso start
+    """
+    if pos is None and not getattr(heuristic, "node_ids", False):
+        pos = getattr(graph, "pos", None)  # coordinate di un CSRGraph
+    kind = HEURISTIC_KERNELS.get(heuristic)
+    goal_pos = pos[goal_id] if pos else goal_id  # una sola lookup per query
+    if kind in ("manhattan", "euclidean"):
+        gx, gy = goal_pos
+    tie_h, tie_g, tie_count = tie_breaking_weights(tie_breaking)
+    edge_lists = graph if isinstance(graph, CSRGraph) else graph.values()
+    queue = graph_queue(queue, edge_lists, kind, pos.values() if pos else None, epsilon)
 
-    while open_list:
-        _, current = heapq.heappop(open_list)
+    # niente oggetti Node: ogni nodo generato riceve un indice locale e il predecessore
+    # è un int32 in parent, così la catena dei padri non tiene in vita nulla
+    slot = {start_id: 0}  # nodo -> indice locale
+    ids = [start_id]
+    parent = array("i", [-1])
+    g_score = [0]  # miglior g noto per indice, le voci peggiori restano nello heap e vengono scartate
+    closed = bytearray(1)
+    expanded = 0
+    nodes_generated = 0
+    open_size = 1  # voci in coda, contate qui invece di chiamare len() a ogni passo
+    open_list_max = 1
 
-        if current.id == goal_node.id:
+    _, push, pop = make_queue(queue)
+    push((0, 0, 0, 0))
+
+    while open_size:
+        current = pop()[-1]
+        open_size -= 1
+        if closed[current]:
+            continue
+
+        current_id = ids[current]
+        if current_id == goal_id:
             path = []
-            cost = 0
-            while current:
-                path.append(current.id)
-                if current.parent:
-                    for neighbor, weight in graph[current.parent.id]:
-                        if neighbor == current.id:
-                            cost += weight
-                            break
-                current = current.parent
-            path = path[::-1]
-
-            return path, {
-                "nodi_espansi": len(closed_set),
+            i = current
+            while i != -1:
+                path.append(ids[i])
+                i = parent[i]
+            path.reverse()
+            closed[current] = 1
+
+            stats = {
+                "nodi_espansi": expanded,
                 "lunghezza_percorso": len(path),
-                "path_cost": cost
+                "path_cost": g_score[current],  # g del goal è già il costo della catena dei padri
+                "nodes_generated": nodes_generated,
+                "open_list_max": open_list_max,
+                "suboptimality_bound": epsilon,
+                "queue": queue
             }
+            if return_tree:
+                stats["search_tree"] = SearchTree(ids, slot, parent, array("d", g_score), closed)
+            return path, stats
 
-        closed_set.add(current.id)
+        closed[current] = 1
+        expanded += 1
+        current_g = g_score[current]
 
-        for neighbor_id, cost in graph[current.id]:
-            if neighbor_id in closed_set:
-                continue
+        for neighbor_id, cost in graph[current_id]:
+            g = current_g + cost
+            i = slot.get(neighbor_id)
+            if i is None:
+                i = len(ids)
+                slot[neighbor_id] = i
+                ids.append(neighbor_id)
+                parent.append(current)
+                g_score.append(g)
+                closed.append(0)
+            else:
+                if closed[i] or g >= g_score[i]:
+                    continue
+                g_score[i] = g
+                parent[i] = current
 
-            neighbor = Node(neighbor_id, current)
-            neighbor.g = current.g + cost
-            neighbor.h = heuristic(pos[neighbor_id], pos[goal_id]) if pos else heuristic(neighbor_id, goal_id)
-            neighbor.f = neighbor.g + neighbor.h
+            if kind == "zero":
+                h = 0
+            else:
+                node_pos = pos[neighbor_id] if pos else neighbor_id
+                if kind == "manhattan":
+                    px, py = node_pos
+                    h = abs(px - gx) + abs(py - gy)
+                elif kind == "euclidean":
+                    px, py = node_pos
+                    h = math.sqrt((px - gx)**2 + (py - gy)**2)
+                else:
+                    h = heuristic(node_pos, goal_pos)
 
-            if any(n.id == neighbor.id and n.f <= neighbor.f for _, n in open_list):
-                continue
+            nodes_generated += 1
+            push((g + epsilon * h, tie_h * h + tie_g * g, tie_count * nodes_generated, i))
+            open_size += 1
+            open_list_max = max(open_list_max, open_size)
 
-            heapq.heappush(open_list, (neighbor.f, neighbor))
-
-    return None, {
-        "nodi_espansi": len(closed_set),
+    stats = {
+        "nodi_espansi": expanded,
         "lunghezza_percorso": 0,
-        "path_cost": 0
-    }  # no path found
+        "path_cost": 0,
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+        "suboptimality_bound": epsilon,
+        "queue": queue
+    }
+    if return_tree:
+        stats["search_tree"] = SearchTree(ids, slot, parent, array("d", g_score), closed)
+    return None, stats  # no path found
+
+
+
+
+def ara_star_graph(graph, start_id, goal_id, heuristic, pos=None, epsilon=3.0, epsilon_step=0.5, deadline=None):
+    """
+    ARA* (Likhachev et al.) su grafo: prima soluzione con f = g + epsilon * h, poi epsilon scende
+    di epsilon_step riusando i g già calcolati, finché il percorso è ottimo o scade il tempo.
+
+    :param deadline: secondi a disposizione dalla chiamata, None = fino all'ottimo
+    :return: (path, stats) dell'ultima soluzione; stats["suboptimality_bound"] è il limite
+             garantito costo / ottimo (INF se non si è trovato alcun percorso in tempo),
+             stats["solutions"] la lista di (secondi, costo, limite) di ogni soluzione
+    """
+    t0 = time.perf_counter()
+    g = {start_id: 0}
+    parent = {start_id: None}
+    h_cache = {}
+
+    def h(node):
+        if node not in h_cache:
+            h_cache[node] = heuristic(pos[node], pos[goal_id]) if pos else heuristic(node, goal_id)
+        return h_cache[node]
+
+    counter = 0  # a parità di chiave decide l'ordine di inserimento, i nodi non vengono confrontati
+    open_list = [(epsilon * h(start_id), counter, start_id)]
+    open_key = {start_id: open_list[0][0]}  # chiave corrente di ogni nodo in open, le altre voci sono obsolete
+    closed_set = set()
+    incons = set()
+    expanded = 0
+    nodes_generated = 0
+    open_list_max = 1
+    timed_out = False
+    best_path, best_cost, bound, solutions = None, 0, INF, []
+
+    def min_open():
+        while open_list and open_key.get(open_list[0][2]) != open_list[0][0]:
+            heapq.heappop(open_list)
+        return open_list[0][0] if open_list else INF
+
+    while True:
+        # improve_path: espande finché il goal non ha la chiave minima
+        while g.get(goal_id, INF) > min_open():
+            if deadline is not None and time.perf_counter() - t0 > deadline:
+                timed_out = True
+                break
+            _, _, current = heapq.heappop(open_list)
+            del open_key[current]
+            closed_set.add(current)
+            expanded += 1
+
+            for neighbor, cost in graph[current]:
+                new_g = g[current] + cost
+                if new_g >= g.get(neighbor, INF):
+                    continue
+                g[neighbor] = new_g
+                parent[neighbor] = current
+                if neighbor in closed_set:
+                    incons.add(neighbor)
+                else:
+                    key = new_g + epsilon * h(neighbor)
+                    open_key[neighbor] = key
+                    counter += 1
+                    heapq.heappush(open_list, (key, counter, neighbor))
+                    nodes_generated += 1
+                    open_list_max = max(open_list_max, len(open_list))
+
+        if timed_out:
+            break
+
+        # limite garantito: costo trovato / minimo g + h tra i nodi ancora da sistemare
+        lower = min([g[n] + h(n) for n in list(open_key) + list(incons)], default=INF)
+        if goal_id in g:
+            bound = min(epsilon, max(1.0, g[goal_id] / lower)) if lower > 0 else 1.0
+            # il costo va salvato con il percorso: dopo un timeout g[goal_id] può già essere
+            # quello di un percorso migliore ma non ancora ricostruito
+            best_path, best_cost = [], g[goal_id]
+            node = goal_id
+            while node is not None:
+                best_path.append(node)
+                node = parent[node]
+            best_path.reverse()
+            solutions.append((round(time.perf_counter() - t0, 6), g[goal_id], bound))
+        if goal_id not in g or bound <= 1:
+            break
 
+        epsilon = max(1.0, epsilon - epsilon_step)
+        for n in incons:
+            open_key[n] = None
+        incons = set()
+        open_list = []
+        for n in open_key:
+            counter += 1
+            open_list.append((g[n] + epsilon * h(n), counter, n))
+        open_key = {n: key for key, _, n in open_list}
+        heapq.heapify(open_list)
+        closed_set = set()
 
+    return best_path, {
+        "nodi_espansi": expanded,
+        "lunghezza_percorso": len(best_path) if best_path else 0,
+        "path_cost": best_cost,
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+        "suboptimality_bound": bound,
+        "solutions": solutions
+    }
@@ -0,0 +1,194 @@
+# batch_graph.py
+# Molte query (start, goal) sullo stesso grafo: il grafo viene indicizzato una volta
+# (nodi -> 0..n-1, adiacenza come lista di liste), i buffer di ricerca sono riutilizzati
+# tra le query (reset O(1) per epoca) e i lotti di query vengono distribuiti su un pool
+# di processi, ognuno con la propria copia del grafo.
+import math
+import os
+import sys
+from array import array
+
+from astar_graph import HEURISTIC_KERNELS, graph_queue, tie_breaking_weights
+from bucket_queue_graph import make_queue
+
+# il pool di processi è condiviso con 2D/: l'implementazione è in common/worker_pool.py
+_COMMON = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+if _COMMON not in sys.path:
+    sys.path.append(_COMMON)
+
+from worker_pool import WorkerPool, run_batches  # noqa: E402
+
+INF = float("inf")
+
+
+def index_graph(graph, pos=None):
+    """
+    :param graph: dizionario {nodo: [(vicino, peso), ...]} come per astar_graph
+    :param pos: dizionario {nodo: (x, y)} opzionale per l'euristica
+    :return: (nodes, index, adjacency, positions) con adjacency[i] = [(j, peso), ...]
+    """
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    adjacency = [[(index[v], weight) for v, weight in graph[node]] for node in nodes]
+    positions = [pos[node] for node in nodes] if pos else None
+    return nodes, index, adjacency, positions
+
+
+class SearchBuffers:
+    """
+    Array di ricerca riutilizzabili tra query sullo stesso grafo indicizzato.
+    g_score e parent valgono solo se visited[i] == epoch, il nodo è chiuso se closed[i] == epoch:
+    reset() incrementa l'epoca e invalida tutto in O(1) senza riscrivere gli array.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.g_score = array("d", [INF]) * size
+        self.parent = array("i", [-1]) * size
+        self.visited = array("I", [0]) * size
+        self.closed = array("I", [0]) * size
+        self.epoch = 0
+
+    def reset(self):
+        self.epoch += 1
+        if self.epoch > 0xFFFFFFFF:
+            self.visited = array("I", [0]) * self.size
+            self.closed = array("I", [0]) * self.size
+            self.epoch = 1
+        return self.epoch
+
+
+def astar_indexed(indexed, start_id, goal_id, heuristic, buffers=None, tie_breaking="fifo", queue="heap"):
+    """
+    A* su un grafo di index_graph; stesso (path, stats), tie_breaking e queue di astar_graph.
+    queue="auto" controlla i pesi a ogni query: astar_many la risolve una volta sola.
+    """
+    nodes, index, adjacency, positions = indexed
+    if buffers is None:
+        buffers = SearchBuffers(len(nodes))
+    epoch = buffers.reset()
+    g_score, parent, visited, closed = buffers.g_score, buffers.parent, buffers.visited, buffers.closed
+
+    start = index[start_id]
+    goal = index[goal_id]
+    # zero, manhattan ed euclidea (con le posizioni) sono calcolate inline nel ciclo, le altre tramite h()
+    kind = HEURISTIC_KERNELS.get(heuristic)
+    tie_h, tie_g, tie_count = tie_breaking_weights(tie_breaking)
+    if kind != "zero" and not positions:
+        kind = None
+    queue = graph_queue(queue, adjacency, kind, positions)
+    if positions:
+        goal_pos = positions[goal]
+        gx, gy = goal_pos
+
+        def h(i):
+            return heuristic(positions[i], goal_pos)
+    else:
+        def h(i):
+            return heuristic(nodes[i], goal_id)
+
+    g_score[start] = 0
+    parent[start] = -1
+    visited[start] = epoch
+    _, push, pop = make_queue(queue)
+    push((h(start), 0, 0, start))
+    expanded = 0
+    nodes_generated = 0
+    open_size = 1  # voci in coda, contate qui invece di chiamare len() a ogni passo
+    open_list_max = 1
+
+    while open_size:
+        current = pop()[-1]
+        open_size -= 1
+        if closed[current] == epoch:
+            continue
+
+        if current == goal:
+            path = []
+            i = current
+            while i != -1:
+                path.append(nodes[i])
+                i = parent[i]
+            path.reverse()
+            return path, {
+                "nodi_espansi": expanded,
+                "lunghezza_percorso": len(path),
+                "path_cost": g_score[goal],
+                "nodes_generated": nodes_generated,
+                "open_list_max": open_list_max,
+                "queue": queue
+            }
+
+        closed[current] = epoch
+        expanded += 1
+        current_g = g_score[current]
+
+        for neighbor, cost in adjacency[current]:
+            if closed[neighbor] == epoch:
+                continue
+            new_g = current_g + cost
+            if visited[neighbor] == epoch and new_g >= g_score[neighbor]:
+                continue
+
+            visited[neighbor] = epoch
+            g_score[neighbor] = new_g
+            parent[neighbor] = current
+            if kind == "zero":
+                h_value = 0
+            elif kind == "euclidean":
+                px, py = positions[neighbor]
+                h_value = math.sqrt((px - gx)**2 + (py - gy)**2)
+            elif kind == "manhattan":
+                px, py = positions[neighbor]
+                h_value = abs(px - gx) + abs(py - gy)
+            else:
+                h_value = h(neighbor)
+            nodes_generated += 1
+            push((new_g + h_value, tie_h * h_value + tie_g * new_g, tie_count * nodes_generated, neighbor))
+            open_size += 1
+            if open_size > open_list_max:
+                open_list_max = open_size
+
+    return None, {
+        "nodi_espansi": expanded,
+        "lunghezza_percorso": 0,
+        "path_cost": 0,
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+        "queue": queue
+    }
+
+
+def _search_task(indexed, heuristic, options):
+    # una volta per processo: i buffer sono riutilizzati da tutte le query del processo
+    buffers = SearchBuffers(len(indexed[0]))
+    return lambda pair: astar_indexed(indexed, pair[0], pair[1], heuristic, buffers, **options)
+
+
+def astar_many(graph, pairs, heuristic, pos=None, workers=1, batch_size=256, stream=False, tie_breaking="fifo",
+               queue="auto"):
+    """
+    Esegue A* per ogni coppia (start, goal) di pairs sullo stesso grafo.
+
+    :param graph: dizionario {nodo: [(vicino, peso), ...]} come per astar_graph
+    :param pairs: lista di coppie (start, goal)
+    :param heuristic: con workers > 1 deve essere una funzione di modulo (picklable), non una lambda
+    :param pos: posizioni dei nodi per l'euristica, come in astar_graph
+    :param workers: numero di processi; con 1 tutto gira nel processo corrente
+    :param batch_size: query per task inviato al pool
+    :param stream: se False restituisce la lista dei (path, stats) nell'ordine di pairs,
+                   se True un generatore di (indice, (path, stats)) nell'ordine di completamento
+    :param tie_breaking: come in astar_graph
+    :param queue: come in astar_graph, "auto" viene risolto una volta per tutte le query
+    """
+    pairs = list(pairs)
+    indexed = index_graph(graph, pos)
+    kind = HEURISTIC_KERNELS.get(heuristic)
+    if kind != "zero" and not pos:
+        kind = None
+    options = {
+        "tie_breaking": tie_breaking,
+        "queue": graph_queue(queue, indexed[2], kind, indexed[3]),
+    }
+
+    return run_batches(pairs, _search_task, (indexed, heuristic, options), workers, batch_size, stream)
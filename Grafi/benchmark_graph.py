@@ -0,0 +1,220 @@
+# benchmark_graph.py
+import csv
+import heapq
+import math
+import random
+import time
+
+import networkx as nx
+import numpy as np
+
+from astar_graph import Node, astar_graph, zero_heuristic, euclidean_heuristic
+from contraction_graph import build_hierarchy, ch_query
+from generate_graph import generate_random_geometric_graph, generate_random_grid_graph, choose_start_and_goal
+
+
+def astar_graph_scan(graph, start_id, goal_id, heuristic, pos=None):
+    """
+    Versione precedente di astar_graph, con la scansione lineare della open list per i duplicati.
+    Tenuta solo come riferimento per il benchmark.
+    """
+    open_list = [(0, Node(start_id))]
+    closed_set = set()
+
+    while open_list:
+        _, current = heapq.heappop(open_list)
+        if current.id == goal_id:
+            path = []
+            while current:
+                path.append(current.id)
+                current = current.parent
+            return path[::-1], {"nodi_espansi": len(closed_set)}
+
+        closed_set.add(current.id)
+
+        for neighbor_id, cost in graph[current.id]:
+            if neighbor_id in closed_set:
+                continue
+            neighbor = Node(neighbor_id, current)
+            neighbor.g = current.g + cost
+            neighbor.h = heuristic(pos[neighbor_id], pos[goal_id]) if pos else heuristic(neighbor_id, goal_id)
+            neighbor.f = neighbor.g + neighbor.h
+            if any(n.id == neighbor.id and n.f <= neighbor.f for _, n in open_list):
+                continue
+            heapq.heappush(open_list, (neighbor.f, neighbor))
+
+    return None, {"nodi_espansi": len(closed_set)}
+
+
+def to_graph_dict(G):
+    return {node: [(v, data["weight"]) for v, data in G[node].items()] for node in G.nodes()}
+
+
+def build_benchmark_graph(graph_type, n, seed=0):
+    """
+    Grafi per il benchmark. Il gnp è costruito senza spring_layout (troppo lento a 10k nodi),
+    quindi pos è None e si usa solo l'euristica nulla. Il grid (griglia lato sqrt(n) con archi
+    rimossi e pesi 1..10) è il più simile a una rete stradale.
+    """
+    if graph_type == "geo":
+        r = 1.5 * math.sqrt(math.log(n) / (math.pi * n))
+        return generate_random_geometric_graph(n=n, r=r, seed=seed)
+    elif graph_type == "grid":
+        np.random.seed(seed)
+        side = int(math.sqrt(n))
+        return generate_random_grid_graph(rows=side, cols=side, remove_edge_prob=0.1)
+    elif graph_type == "gnp":
+        G = nx.gnp_random_graph(n, 20 / n, seed=seed)
+        rng = np.random.default_rng(seed)
+        for u, v in G.edges():
+            G.edges[u, v]["weight"] = int(rng.integers(1, 11))
+        return G, None
+    raise ValueError(f"Tipo di grafo non valido: {graph_type}")
+
+
+def run_open_list_benchmark(filename="benchmark_graph_open_list.csv", sizes=(1000, 3000, 10000),
+                            graph_types=("geo", "gnp"), seed=0, scan_max_nodes=10000):
+    """
+    Confronta la open list con scansione lineare (astar_graph_scan) con quella indicizzata
+    (astar_graph) su grafi di dimensione crescente.
+
+    :param scan_max_nodes: oltre questa dimensione la versione lineare non viene eseguita
+    """
+    engines = {
+        "astar_graph_scan": astar_graph_scan,
+        "astar_graph": astar_graph,
+    }
+
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=[
+            "graph", "n_nodes", "n_edges", "engine", "success", "nodes_expanded", "time_sec", "us_per_expansion"
+        ])
+        writer.writeheader()
+
+        for graph_type in graph_types:
+            for n in sizes:
+                G, pos = build_benchmark_graph(graph_type, n, seed)
+                graph_dict = to_graph_dict(G)
+                random.seed(seed + n)
+                start, goal = choose_start_and_goal(G, must_be_connected=True)
+                heuristic = euclidean_heuristic if pos else zero_heuristic
+
+                for name, func in engines.items():
+                    if name == "astar_graph_scan" and n > scan_max_nodes:
+                        continue
+                    t0 = time.perf_counter()
+                    path, stats = func(graph_dict, start, goal, heuristic, pos)
+                    t1 = time.perf_counter()
+
+                    expanded = stats["nodi_espansi"]
+                    writer.writerow({
+                        "graph": graph_type,
+                        "n_nodes": n,
+                        "n_edges": G.number_of_edges(),
+                        "engine": name,
+                        "success": "yes" if path else "no",
+                        "nodes_expanded": expanded,
+                        "time_sec": round(t1 - t0, 6),
+                        "us_per_expansion": round((t1 - t0) * 1e6 / max(expanded, 1), 3)
+                    })
+                    print(f" {graph_type}_{n} | {name:16s} → {t1 - t0:.4f} s, {expanded} nodi espansi")
+
+
+def run_queue_benchmark(filename="benchmark_graph_queues.csv", sizes=(1000, 3000, 10000),
+                        graph_types=("geo", "gnp"), seed=0, queries=20, queues=("heap", "dial", "radix")):
+    """
+    Confronta heapq con le code a bucket di bucket_queue_graph (Dial e radix) in astar_graph.
+    I pesi di generate_graph sono interi ma le posizioni no, quindi si usa l'euristica nulla:
+    è il caso in cui queue="auto" sceglie una coda a bucket.
+    """
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=[
+            "graph", "n_nodes", "n_edges", "queue", "queries", "nodes_expanded", "time_sec", "us_per_expansion"
+        ])
+        writer.writeheader()
+
+        for graph_type in graph_types:
+            for n in sizes:
+                G, _ = build_benchmark_graph(graph_type, n, seed)
+                graph_dict = to_graph_dict(G)
+                random.seed(seed + n)
+                pairs = [choose_start_and_goal(G, must_be_connected=True) for _ in range(queries)]
+
+                for queue in queues:
+                    expanded = 0
+                    t0 = time.perf_counter()
+                    for start, goal in pairs:
+                        _, stats = astar_graph(graph_dict, start, goal, zero_heuristic, queue=queue)
+                        expanded += stats["nodi_espansi"]
+                    t1 = time.perf_counter()
+
+                    writer.writerow({
+                        "graph": graph_type,
+                        "n_nodes": n,
+                        "n_edges": G.number_of_edges(),
+                        "queue": queue,
+                        "queries": queries,
+                        "nodes_expanded": expanded,
+                        "time_sec": round(t1 - t0, 6),
+                        "us_per_expansion": round((t1 - t0) * 1e6 / max(expanded, 1), 3)
+                    })
+                    print(f" {graph_type}_{n} | {queue:5s} → {t1 - t0:.4f} s, {expanded} nodi espansi")
+
+
+def run_ch_benchmark(filename="benchmark_graph_ch.csv", sizes=(2500, 10000, 40000), graph_types=("grid",),
+                     seed=0, queries=100, witness_limit=50):
+    """
+    Confronta le query di Contraction Hierarchies (contraction_graph.ch_query) con astar_graph
+    (euristica euclidea sulle posizioni) su grafi simili a reti stradali.
+    La costruzione della gerarchia è riportata a parte (preprocessing_sec) e non entra nel tempo delle query.
+    """
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=[
+            "graph", "n_nodes", "n_edges", "engine", "preprocessing_sec", "shortcuts", "queries",
+            "nodes_expanded", "time_sec", "ms_per_query"
+        ])
+        writer.writeheader()
+
+        for graph_type in graph_types:
+            for n in sizes:
+                G, pos = build_benchmark_graph(graph_type, n, seed)
+                graph_dict = to_graph_dict(G)
+                random.seed(seed + n)
+                pairs = [choose_start_and_goal(G, must_be_connected=True) for _ in range(queries)]
+
+                t0 = time.perf_counter()
+                hierarchy = build_hierarchy(graph_dict, witness_limit)
+                hierarchy.adjacency()
+                preprocessing = time.perf_counter() - t0
+
+                engines = {
+                    "astar_graph": lambda s, t: astar_graph(graph_dict, s, t, euclidean_heuristic, pos),
+                    "ch_query": lambda s, t: ch_query(hierarchy, s, t),
+                }
+                for name, func in engines.items():
+                    expanded = 0
+                    t0 = time.perf_counter()
+                    for start, goal in pairs:
+                        _, stats = func(start, goal)
+                        expanded += stats["nodi_espansi"]
+                    t1 = time.perf_counter()
+
+                    is_ch = name == "ch_query"
+                    writer.writerow({
+                        "graph": graph_type,
+                        "n_nodes": G.number_of_nodes(),
+                        "n_edges": G.number_of_edges(),
+                        "engine": name,
+                        "preprocessing_sec": round(preprocessing, 3) if is_ch else 0,
+                        "shortcuts": hierarchy.number_of_shortcuts() if is_ch else 0,
+                        "queries": queries,
+                        "nodes_expanded": expanded,
+                        "time_sec": round(t1 - t0, 6),
+                        "ms_per_query": round((t1 - t0) * 1e3 / queries, 3)
+                    })
+                    print(f" {graph_type}_{n} | {name:11s} → {(t1 - t0) * 1e3 / queries:.3f} ms/query, "
+                          f"{expanded / queries:.0f} nodi espansi")
+
+
+if __name__ == "__main__":
+    run_open_list_benchmark()
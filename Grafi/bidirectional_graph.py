@@ -0,0 +1,122 @@
+# bidirectional_graph.py
+# A* bidirezionale (NBA*, Pijls & Post) sui grafi a dizionario di adiacenza
+# {nodo: [(vicino, peso), ...]} usati da astar_graph.
+# Serve un'euristica consistente; con pos=None si usa heuristic(nodo, target) come in astar_graph.
+import heapq
+import itertools
+
+from astar_graph import tie_breaking_weights
+
+INF = float("inf")
+
+
+def reverse_adjacency(graph):
+    """Grafo con gli archi invertiti; per i grafi non orientati convertiti da networkx coincide con graph."""
+    reverse = {node: [] for node in graph}
+    for u, edges in graph.items():
+        for v, weight in edges:
+            reverse.setdefault(v, []).append((u, weight))
+    return reverse
+
+
+def bidirectional_astar_graph(graph, start_id, goal_id, heuristic, pos=None, reverse_graph=None, tie_breaking="fifo"):
+    """
+    Stessa interfaccia e stesso (path, stats) di astar_graph; le statistiche riportano anche
+    i nodi espansi in ciascuna direzione (nodes_expanded_forward / nodes_expanded_backward).
+
+    :param reverse_graph: adiacenza inversa già calcolata (reverse_adjacency); per i grafi
+                          non orientati si può passare graph stesso
+    :param tie_breaking: ordine tra nodi con lo stesso f in ciascuna direzione, come in astar_graph
+    """
+    if reverse_graph is None:
+        reverse_graph = reverse_adjacency(graph)
+
+    if pos:
+        def h(node, target):
+            return heuristic(pos[node], pos[target])
+    else:
+        h = heuristic
+
+    # indice 0 = avanti (start -> goal), 1 = indietro (goal -> start)
+    adjacency = (graph, reverse_graph)
+    targets = (goal_id, start_id)
+    g_score = ({start_id: 0}, {goal_id: 0})
+    parent = ({start_id: None}, {goal_id: None})
+    closed = set()
+    tie_h, tie_g, tie_count = tie_breaking_weights(tie_breaking)
+    counter = itertools.count()  # i nodi possono non essere confrontabili tra loro
+    open_lists = ([], [])
+    for side, node, target in ((0, start_id, goal_id), (1, goal_id, start_id)):
+        start_h = h(node, target)
+        open_lists[side].append((start_h, tie_h * start_h, tie_count * next(counter), node))
+    best_f = [open_lists[0][0][0], open_lists[1][0][0]]
+    expanded = [0, 0]
+    nodes_generated = 0
+    open_list_max = 1
+
+    best_cost = INF  # L
+    meeting = None
+    if start_id == goal_id:
+        best_cost, meeting = 0, start_id
+
+    while open_lists[0] and open_lists[1]:
+        side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+        other = 1 - side
+        open_list = open_lists[side]
+        g_side, g_other = g_score[side], g_score[other]
+
+        f, _, _, current = heapq.heappop(open_list)
+        if current not in closed:
+            closed.add(current)
+            current_g = g_side[current]
+
+            if (f < best_cost
+                    and current_g + best_f[other] - h(current, targets[other]) < best_cost):
+                expanded[side] += 1
+                for neighbor_id, cost in adjacency[side].get(current, []):
+                    if neighbor_id in closed:
+                        continue
+                    new_g = current_g + cost
+                    if new_g >= g_side.get(neighbor_id, INF):
+                        continue
+
+                    g_side[neighbor_id] = new_g
+                    parent[side][neighbor_id] = current
+                    nh = h(neighbor_id, targets[side])
+                    heapq.heappush(open_list, (new_g + nh, tie_h * nh + tie_g * new_g, tie_count * next(counter),
+                                               neighbor_id))
+                    nodes_generated += 1
+                    open_list_max = max(open_list_max, len(open_list))
+
+                    total = new_g + g_other.get(neighbor_id, INF)
+                    if total < best_cost:
+                        best_cost = total
+                        meeting = neighbor_id
+
+        if open_list:
+            best_f[side] = open_list[0][0]
+
+    stats = {
+        "nodi_espansi": expanded[0] + expanded[1],
+        "nodes_expanded_forward": expanded[0],
+        "nodes_expanded_backward": expanded[1],
+        "nodes_generated": nodes_generated,
+        "open_list_max": open_list_max,
+    }
+    if meeting is None:
+        stats.update({"lunghezza_percorso": 0, "path_cost": 0})
+        return None, stats
+
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = parent[0][node]
+    path.reverse()
+    node = parent[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = parent[1][node]
+
+    stats.update({"lunghezza_percorso": len(path), "path_cost": best_cost})
+    return path, stats
@@ -0,0 +1,10 @@
+# bucket_queue_graph.py
+# Le code a bucket sono condivise con 2D/: l'implementazione è in common/bucket_queue.py.
+import os
+import sys
+
+_COMMON = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+if _COMMON not in sys.path:
+    sys.path.append(_COMMON)
+
+from bucket_queue import QUEUES, DIAL_MAX_COST, DialQueue, RadixQueue, make_queue, select_queue  # noqa: E402
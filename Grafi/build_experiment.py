@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 import networkx as nx
 from generate_graph import generate_random_grid_graph, choose_start_and_goal
 from astar_graph import astar_graph, euclidean_heuristic, manhattan_heuristic
+from bidirectional_graph import bidirectional_astar_graph
 from researchgraphalgo import bfs, dfs
 
 
@@ -32,6 +33,9 @@ def run_experiment_from_generator(G, pos, start, goal, graph_name="custom_graph"
         "astar": lambda g, s, t: astar_graph(g, s, t, heuristic=lambda a, b: 0),
         "astar_manhattan": lambda g, s, t: astar_graph(g, s, t, heuristic=manhattan_heuristic, pos=pos),
     "astar_euclidean": lambda g, s, t: astar_graph(g, s, t, heuristic=euclidean_heuristic, pos=pos),
+        # grafo non orientato: l'adiacenza inversa coincide con graph_dict
+        "astar_bidirectional": lambda g, s, t: bidirectional_astar_graph(g, s, t, heuristic=euclidean_heuristic,
+                                                                         pos=pos, reverse_graph=g),
         "bfs": bfs,
         "dfs": dfs
     }
@@ -0,0 +1,176 @@
+# csr_graph.py
+# Grafo in formato compressed sparse row: i vicini del nodo i sono indices[indptr[i]:indptr[i + 1]]
+# con pesi weights[...] nelle stesse posizioni. Tre array NumPy invece di un dizionario di liste
+# di tuple: costruzione vettoriale e una frazione della memoria oltre ~1e5 archi.
+# CSRGraph si comporta come il dizionario {nodo: [(vicino, peso), ...]} (graph[nodo], get, values,
+# iterazione sui nodi), quindi astar_graph, bfs, dfs e gli altri algoritmi lo accettano così com'è.
+# Ogni graph[nodo] però costruisce una lista di tuple dagli array: serve a risparmiare memoria,
+# non tempo. Gli esperimenti cronometrati usano il dizionario, e index_graph (batch_graph.py)
+# converte un CSRGraph una volta sola per molte query.
+import numpy as np
+
+
+class CoordinateView:
+    """Posizioni dei nodi lette da coords[i], con la stessa interfaccia del dizionario pos."""
+
+    def __init__(self, coords, graph):
+        self.coords = coords
+        self.graph = graph
+
+    def __getitem__(self, node):
+        x, y = self.coords[self.graph.position(node)].tolist()
+        return x, y
+
+    def __len__(self):
+        return len(self.coords)
+
+    def values(self):
+        return map(tuple, self.coords.tolist())
+
+
+class CSRGraph:
+    """
+    :param indptr: int64, lunghezza n + 1
+    :param indices: int32, vicini (indici 0..n-1) riga per riga
+    :param weights: pesi degli archi, interi se tutti i pesi lo sono (path_cost resta intero)
+    :param coords: array (n, 2) opzionale, esposto come pos per le euristiche
+    :param nodes: etichette dei nodi nell'ordine degli indici; None se i nodi sono 0..n-1
+    """
+
+    def __init__(self, indptr, indices, weights, coords=None, nodes=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.coords = coords
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)} if nodes is not None else None
+        self.pos = CoordinateView(coords, self) if coords is not None else None
+
+    def position(self, node):
+        """Indice 0..n-1 del nodo."""
+        if self.index is not None:
+            return self.index[node]
+        if not 0 <= node < len(self.indptr) - 1:
+            raise KeyError(node)
+        return node
+
+    def __getitem__(self, node):
+        i = self.position(node)
+        a, b = self.indptr[i], self.indptr[i + 1]
+        neighbors = self.indices[a:b].tolist()
+        if self.nodes is not None:
+            neighbors = [self.nodes[j] for j in neighbors]
+        return list(zip(neighbors, self.weights[a:b].tolist()))
+
+    def get(self, node, default=None):
+        if node not in self:
+            return default
+        return self[node]
+
+    def __contains__(self, node):
+        if self.index is not None:
+            return node in self.index
+        return isinstance(node, (int, np.integer)) and 0 <= node < len(self.indptr) - 1
+
+    def __iter__(self):
+        return iter(self.nodes) if self.nodes is not None else iter(range(len(self.indptr) - 1))
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (self[node] for node in self)
+
+    def items(self):
+        return ((node, self[node]) for node in self)
+
+    def number_of_nodes(self):
+        return len(self.indptr) - 1
+
+    def number_of_edges(self):
+        """Archi memorizzati: per un grafo non orientato ogni arco conta due volte."""
+        return len(self.indices)
+
+    def integer_weights(self):
+        """(True se tutti i pesi sono interi, peso massimo), come astar_graph.integer_weights."""
+        if not len(self.weights):
+            return True, 1
+        integral = bool(np.issubdtype(self.weights.dtype, np.integer) or np.all(np.mod(self.weights, 1) == 0))
+        return integral, max(self.weights.max().item(), 1)
+
+
+def _weights_array(weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    if len(weights) and np.all(np.mod(weights, 1) == 0):
+        return weights.astype(np.int64)
+    return weights
+
+
+def _coords_array(pos, nodes):
+    if pos is None:
+        return None
+    if isinstance(pos, dict):
+        return np.array([pos[node] for node in nodes], dtype=np.float64)
+    return np.asarray(pos, dtype=np.float64)
+
+
+def csr_from_networkx(G, pos=None, weight="weight"):
+    """
+    :param G: grafo NetworkX, orientato o no (per i non orientati ogni arco compare in entrambe le righe)
+    :param pos: dizionario {nodo: (x, y)} o array (n, 2) nell'ordine di G.nodes()
+    :param weight: attributo del peso, 1 se manca
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    identity = all(isinstance(node, int) and node == i for i, node in enumerate(nodes))
+    index = None if identity else {node: i for i, node in enumerate(nodes)}
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(G[node]) for node in nodes])
+    total = int(indptr[-1])
+    if identity:
+        neighbors = (v for u in nodes for v in G[u])
+    else:
+        neighbors = (index[v] for u in nodes for v in G[u])
+    indices = np.fromiter(neighbors, dtype=np.int32, count=total)
+    weights = np.fromiter((data.get(weight, 1) for u in nodes for data in G[u].values()),
+                          dtype=np.float64, count=total)
+
+    return CSRGraph(indptr, indices, _weights_array(weights), _coords_array(pos, nodes),
+                    None if identity else nodes)
+
+
+def csr_from_edges(edges, n=None, directed=False, coords=None):
+    """
+    :param edges: sequenza o array di (u, v) o (u, v, peso) con nodi interi 0..n-1; peso 1 se manca
+    :param n: numero di nodi, di default il massimo indice + 1
+    :param directed: se False ogni arco è aggiunto in entrambe le direzioni
+    """
+    edges = np.asarray(edges)
+    if edges.size == 0:
+        edges = edges.reshape(0, 2)
+    u = edges[:, 0].astype(np.int64)
+    v = edges[:, 1].astype(np.int64)
+    w = edges[:, 2] if edges.shape[1] > 2 else np.ones(len(edges))
+    if n is None:
+        n = int(max(u.max(initial=-1), v.max(initial=-1))) + 1
+    if not directed:
+        u, v, w = np.concatenate([u, v]), np.concatenate([v, u]), np.concatenate([w, w])
+
+    order = np.argsort(u, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(u, minlength=n))
+    return CSRGraph(indptr, v[order].astype(np.int32), _weights_array(w[order]), _coords_array(coords, range(n)))
+
+
+def csr_from_scipy(matrix, coords=None):
+    """
+    :param matrix: matrice di adiacenza SciPy (qualsiasi formato sparso): matrix[u, v] = peso di u -> v
+    """
+    matrix = matrix.tocsr()
+    matrix.sort_indices()
+    return CSRGraph(matrix.indptr.astype(np.int64), matrix.indices.astype(np.int32),
+                    _weights_array(matrix.data), _coords_array(coords, range(matrix.shape[0])))
@@ -0,0 +1,105 @@
+# diameter_graph.py
+# Coppia di nodi più lontani (diametro pesato) senza un Dijkstra da ogni nodo.
+# - double_sweep: Dijkstra da un nodo r, poi dal nodo a più lontano; (a, b) è una stima dal basso
+#   del diametro, spesso esatta su grafi sparsi. 2 Dijkstra.
+# - four_sweep: due double sweep, il secondo dal punto medio del primo cammino (Crescenzi et al.),
+#   che è anche un buon centro per iFUB. 4 Dijkstra.
+# - exact: iFUB pesato. Dal centro u si calcolano le eccentricità dei nodi in ordine di d(u, v)
+#   decrescente: due nodi non ancora visitati distano al più d(u, v1) + d(u, v2) <= 2 * d(u, v),
+#   quindi appena il miglior valore trovato è >= 2 * d(u, prossimo nodo) il diametro è esatto.
+# Vale per grafi non orientati e connessi (generate_graph usa la componente più grande).
+import random
+from batch_graph import WorkerPool, index_graph
+from landmarks_graph import _dijkstra
+
+DIAMETER_MODES = ("exact", "four_sweep", "double_sweep")
+
+def _eccentricity(adjacency, source):
+    """(eccentricità di source, nodo più lontano)."""
+    dist, _, order = _dijkstra(adjacency, source)
+    return dist[order[-1]], order[-1]
+
+
+def _eccentricity_task(adjacency):
+    return lambda source: _eccentricity(adjacency, source)
+
+
+def _midpoint(dist, parent, far):
+    """Nodo del cammino minimo verso far con distanza dalla sorgente più vicina a metà."""
+    half = dist[far] / 2
+    best = node = far
+    while node != -1:
+        if abs(dist[node] - half) < abs(dist[best] - half):
+            best = node
+        node = parent[node]
+    return best
+
+
+def diameter_bounds(graph, mode="exact", seed=0, workers=1, batch_size=8):
+    """
+    :param graph: dizionario {nodo: [(vicino, peso), ...]} o CSRGraph, non orientato e connesso
+    :param mode: uno tra DIAMETER_MODES
+    :param seed: sceglie il nodo di partenza del primo sweep
+    :param workers: processi per le eccentricità di iFUB (solo mode="exact"); il risultato non cambia
+    :param batch_size: eccentricità per task inviato al pool
+    :return: dizionario con start, goal (la coppia più lontana trovata), lower (= d(start, goal)),
+             upper (limite superiore del diametro) e dijkstra (ricerche complete eseguite)
+    """
+    if mode not in DIAMETER_MODES:
+        raise ValueError(f"mode non valido: usa uno tra {', '.join(DIAMETER_MODES)}")
+    nodes, _, adjacency, _ = index_graph(graph)
+    if not nodes:
+        raise ValueError("Il grafo è vuoto")
+
+    # primo double sweep: r -> a (il più lontano da r) -> b (il più lontano da a)
+    root = random.Random(seed).randrange(len(nodes))
+    dist, _, order = _dijkstra(adjacency, root)
+    upper = 2 * dist[order[-1]]  # d(x, y) <= d(x, r) + d(r, y)
+    a = order[-1]
+    dist, parent, order = _dijkstra(adjacency, a)
+    lower, start, goal = dist[order[-1]], a, order[-1]
+    searches = 2
+
+    if mode != "double_sweep":
+        # secondo double sweep dal punto medio del cammino a -> b
+        center = _midpoint(dist, parent, goal)
+        dist_center, _, center_order = _dijkstra(adjacency, center)
+        upper = min(upper, 2 * dist_center[center_order[-1]])
+        a = center_order[-1]
+        dist, _, order = _dijkstra(adjacency, a)
+        searches += 2
+        if dist[order[-1]] > lower:
+            lower, start, goal = dist[order[-1]], a, order[-1]
+
+    if mode == "exact":
+        fringe = center_order[::-1]  # per distanza dal centro decrescente
+        step = workers * batch_size if workers > 1 else 1
+        with WorkerPool(_eccentricity_task, (adjacency,), workers, batch_size) as pool:
+            i = 0
+            while i < len(fringe) and lower < upper:
+                if lower >= 2 * dist_center[fringe[i]]:
+                    upper = lower  # le coppie rimaste non possono superare lower
+                    break
+                batch = fringe[i:i + step]
+                results = pool.map(batch)
+                searches += len(batch)
+                for v, (ecc, far) in zip(batch, results):
+                    if ecc > lower:
+                        lower, start, goal = ecc, v, far
+                i += len(batch)
+            else:
+                upper = lower  # tutte le eccentricità calcolate o limiti già coincidenti
+
+    return {
+        "start": nodes[start],
+        "goal": nodes[goal],
+        "lower": lower,
+        "upper": upper,
+        "dijkstra": searches,
+    }
+
+
+def diameter_endpoints(graph, mode="exact", seed=0, workers=1, batch_size=8):
+    """(start, goal) più lontani secondo diameter_bounds: esatti con mode="exact", stimati con gli sweep."""
+    bounds = diameter_bounds(graph, mode, seed, workers, batch_size)
+    return bounds["start"], bounds["goal"]
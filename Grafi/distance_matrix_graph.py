@@ -0,0 +1,117 @@
+# distance_matrix_graph.py
+# Matrice delle distanze sources x targets: invece di una query A* per ogni coppia, una sola
+# ricerca di Dijkstra per sorgente verso tutti i target insieme, interrotta appena l'ultimo
+# target è chiuso. Il grafo è indicizzato una volta (batch_graph.index_graph) e le sorgenti
+# vengono divise in lotti su un pool di processi, come in batch_graph.astar_many.
+import numpy as np
+
+from astar_graph import graph_queue
+from batch_graph import SearchBuffers, index_graph, run_batches
+from bucket_queue_graph import make_queue
+
+INF = float("inf")
+
+
+def search_targets(indexed, source, target_indices, buffers, queue="heap", paths=False):
+    """
+    Dijkstra da source (indice) fino alla chiusura di tutti i target_indices.
+
+    :return: (distanze nell'ordine di target_indices, INF se irraggiungibile,
+              percorsi come liste di nodi o None, nodi espansi)
+    """
+    nodes, _, adjacency, _ = indexed
+    epoch = buffers.reset()
+    g_score, parent, visited, closed = buffers.g_score, buffers.parent, buffers.visited, buffers.closed
+    pending = set(target_indices)
+
+    g_score[source] = 0
+    parent[source] = -1
+    visited[source] = epoch
+    _, push, pop = make_queue(queue)
+    push((0, 0, 0, source))
+    open_size = 1
+    expanded = 0
+    count = 0
+
+    while open_size and pending:
+        d, _, _, current = pop()
+        open_size -= 1
+        if closed[current] == epoch:
+            continue
+        closed[current] = epoch
+        pending.discard(current)
+        if not pending:
+            break  # tutti i target hanno la distanza definitiva
+        expanded += 1
+
+        for neighbor, cost in adjacency[current]:
+            if closed[neighbor] == epoch:
+                continue
+            new_g = d + cost
+            if visited[neighbor] == epoch and new_g >= g_score[neighbor]:
+                continue
+            visited[neighbor] = epoch
+            g_score[neighbor] = new_g
+            parent[neighbor] = current
+            count += 1
+            push((new_g, 0, count, neighbor))
+            open_size += 1
+
+    distances = [g_score[t] if closed[t] == epoch else INF for t in target_indices]
+    if not paths:
+        return distances, None, expanded
+
+    routes = []
+    for t in target_indices:
+        if closed[t] != epoch:
+            routes.append(None)
+            continue
+        route = []
+        i = t
+        while i != -1:
+            route.append(nodes[i])
+            i = parent[i]
+        route.reverse()
+        routes.append(route)
+    return distances, routes, expanded
+
+
+def _search_task(indexed, target_indices, queue, paths):
+    # una volta per processo: i buffer sono riutilizzati da tutte le sorgenti del processo
+    buffers = SearchBuffers(len(indexed[0]))
+    return lambda source: search_targets(indexed, source, target_indices, buffers, queue, paths)
+
+
+def distance_matrix(graph, sources, targets=None, paths=False, workers=1, batch_size=16, queue="auto"):
+    """
+    Distanze minime da ogni sorgente a ogni target.
+
+    :param graph: dizionario {nodo: [(vicino, peso), ...]} o CSRGraph, come per astar_graph
+    :param targets: nodi di arrivo, di default gli stessi di sources (matrice quadrata)
+    :param paths: se True restituisce anche i percorsi
+    :param workers: numero di processi; con 1 tutto gira nel processo corrente
+    :param batch_size: sorgenti per task inviato al pool
+    :param queue: come in astar_graph; con l'euristica nulla e pesi interi "auto" sceglie Dial o radix
+    :return: (dist, routes, stats): dist è un array NumPy len(sources) x len(targets) con INF per
+             le coppie non collegate, routes[i][j] il percorso (None se non richiesto o non esiste),
+             stats["nodi_espansi"] il totale delle espansioni
+    """
+    sources = list(sources)
+    targets = sources if targets is None else list(targets)
+    indexed = index_graph(graph)
+    index = indexed[1]
+    source_indices = [index[s] for s in sources]
+    target_indices = [index[t] for t in targets]
+    queue = graph_queue(queue, indexed[2], "zero")
+
+    rows = run_batches(source_indices, _search_task, (indexed, target_indices, queue, paths), workers, batch_size)
+
+    dist = np.array([row[0] for row in rows], dtype=np.float64).reshape(len(sources), len(targets))
+    routes = [row[1] for row in rows] if paths else None
+    return dist, routes, {"nodi_espansi": sum(row[2] for row in rows), "queue": queue}
+
+
+def one_to_many(graph, source, targets, paths=False, queue="heap"):
+    """Una riga di distance_matrix: (distanze, percorsi o None) da source verso ogni target."""
+    dist, routes, _ = distance_matrix(graph, [source], targets, paths=paths, queue=queue)
+    return dist[0].tolist(), routes[0] if paths else None
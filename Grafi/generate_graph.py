@@ -3,6 +3,8 @@ import networkx as nx
 import matplotlib.pyplot as plt
 import random
 
+from diameter_graph import diameter_endpoints
+
 def generate_geometric_graph(n=50, r=0.2, seed=42):
     """
     Crea un grafo geometrico con n nodi posizionati casualmente nel piano [0,1]x[0,1],
@@ -169,46 +171,34 @@ def choose_start_and_goal(G, must_be_connected=True):
     goal = random.choice(goal_choices)
     return start, goal
 
-def get_most_distant_nodes(G):
-    """
-    Restituisce la coppia di nodi (start, goal) più lontani nel grafo (in termini di numero di archi).
-    Funziona solo se il grafo è connesso.
-    """
+def _largest_component_adjacency(G, weight):
+    """Componente connessa più grande di G come {nodo: [(vicino, peso), ...]}; peso 1 se weight è None."""
     if not nx.is_connected(G):
         G = max((G.subgraph(c) for c in nx.connected_components(G)), key=len)
-
-    lengths = dict(nx.all_pairs_shortest_path_length(G))
-    max_dist = -1
-    start, goal = None, None
-
-    for u in lengths:
-        for v in lengths[u]:
-            if lengths[u][v] > max_dist:
-                max_dist = lengths[u][v]
-                start, goal = u, v
-
-    return start, goal
+    if weight is None:
+        return {u: [(v, 1) for v in G[u]] for u in G.nodes()}
+    return {u: [(v, data.get(weight, 1)) for v, data in G[u].items()] for u in G.nodes()}
 
 
-def get_most_distant_nodes_weighted(G, weight="weight"):
+def get_most_distant_nodes(G, mode="exact", workers=1):
     """
-    Restituisce la coppia (start, goal) con la massima distanza Dijkstra.
-    Usa pesi sugli archi.
+    Restituisce la coppia di nodi (start, goal) più lontani nel grafo (in termini di numero di archi).
+    Se il grafo non è connesso usa la componente più grande. Vedi get_most_distant_nodes_weighted.
     """
-    if not nx.is_connected(G):
-        G = max((G.subgraph(c) for c in nx.connected_components(G)), key=len)
+    return diameter_endpoints(_largest_component_adjacency(G, None), mode=mode, workers=workers)
 
-    max_dist = -1
-    start, goal = None, None
 
-    for source in G.nodes():
-        lengths = nx.single_source_dijkstra_path_length(G, source, weight=weight)
-        for target, dist in lengths.items():
-            if dist > max_dist:
-                max_dist = dist
-                start, goal = source, target
+def get_most_distant_nodes_weighted(G, weight="weight", mode="exact", workers=1):
+    """
+    Restituisce la coppia (start, goal) con la massima distanza Dijkstra.
+    Usa pesi sugli archi. Se il grafo non è connesso usa la componente più grande.
 
-    return start, goal
+    :param mode: "exact" (iFUB, di solito poche decine di Dijkstra invece di una per nodo),
+                 "four_sweep" o "double_sweep" (4 o 2 Dijkstra, coppia molto lontana ma non garantita
+                 la più lontana); vedi diameter_graph
+    :param workers: processi per le ricerche di iFUB
+    """
+    return diameter_endpoints(_largest_component_adjacency(G, weight), mode=mode, workers=workers)
 
 
 # Esempio d'uso
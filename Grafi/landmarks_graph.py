@@ -0,0 +1,269 @@
+# landmarks_graph.py
+# ALT (A*, Landmarks, Triangle inequality, Goldberg e Harrelson): per gnp e gnk le posizioni vengono
+# da spring_layout, quindi manhattan ed euclidea non sono né ammissibili né informative. Qui si
+# scelgono k landmark, si calcolano una volta le distanze esatte da ciascuno verso tutti i nodi e
+# per la disuguaglianza triangolare |d(L, t) - d(L, v)| <= d(v, t) per ogni landmark L:
+# il massimo su tutti i landmark è un'euristica ammissibile e consistente sui soli id dei nodi.
+# Vale per grafi non orientati (d(L, v) = d(v, L)), come quelli di generate_graph.
+import hashlib
+import heapq
+import os
+import random
+from array import array
+from operator import sub
+
+import numpy as np
+
+from batch_graph import index_graph
+from csr_graph import CSRGraph
+
+INF = float("inf")
+
+LANDMARK_METHODS = ("farthest", "avoid", "random")
+FIRST_ROOT_ATTEMPTS = 8  # radici provate per il primo landmark di "farthest" prima di rinunciare
+
+
+def _dijkstra(adjacency, source):
+    """
+    Distanze da source a tutti i nodi di un grafo indicizzato.
+
+    :return: (dist array('d') con INF se irraggiungibile, parent array('i'), nodi nell'ordine di chiusura)
+    """
+    n = len(adjacency)
+    dist = array("d", [INF]) * n
+    parent = array("i", [-1]) * n
+    closed = bytearray(n)
+    order = []
+    dist[source] = 0
+    open_list = [(0, source)]
+
+    while open_list:
+        d, current = heapq.heappop(open_list)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        order.append(current)
+        for neighbor, cost in adjacency[current]:
+            new_d = d + cost
+            if new_d < dist[neighbor]:
+                dist[neighbor] = new_d
+                parent[neighbor] = current
+                heapq.heappush(open_list, (new_d, neighbor))
+
+    return dist, parent, order
+
+
+def _lower_bounds(columns, source):
+    """Euristica ALT da source verso tutti i nodi con i landmark già scelti (0 se non ce ne sono)."""
+    if not columns:
+        return 0
+    table = np.stack(columns, axis=1)
+    table = np.where(np.isinf(table), 0, table)  # landmark in un'altra componente: nessuna informazione
+    return np.abs(table - table[source]).max(axis=1)
+
+
+def _first_farthest(adjacency, rng):
+    """
+    Il primo landmark è il nodo più lontano da una radice casuale. La radice si sceglie tra i nodi
+    con almeno un arco: da un nodo isolato (o raggiunto solo da archi di peso 0) non c'è un nodo
+    più lontano, quindi si riprova con un'altra radice.
+    """
+    roots = [v for v in range(len(adjacency)) if adjacency[v]]
+    rng.shuffle(roots)
+    for root in roots[:FIRST_ROOT_ATTEMPTS]:
+        dist = np.frombuffer(_dijkstra(adjacency, root)[0], dtype=np.float64)
+        dist = np.where(np.isinf(dist), -1, dist)
+        best = int(np.argmax(dist))
+        if dist[best] > 0:
+            return best
+    return None
+
+
+def _next_farthest(adjacency, columns, chosen, rng):
+    if not columns:
+        return _first_farthest(adjacency, rng)
+    closest = np.min(np.stack(columns), axis=0)
+    closest = np.where(np.isinf(closest), -1, closest)
+    closest[chosen] = -1
+    best = int(np.argmax(closest))
+    return best if closest[best] > 0 else None
+
+
+def _next_avoid(adjacency, columns, chosen, rng):
+    """
+    Metodo avoid: dall'albero dei cammini minimi di una radice casuale r, il peso di v è
+    d(r, v) meno il limite inferiore dato dai landmark attuali, size(v) la somma dei pesi del
+    sottoalbero (0 se contiene già un landmark). Si scende da r verso il figlio con size
+    maggiore fino a una foglia, che diventa il nuovo landmark: la zona coperta peggio.
+    """
+    n = len(adjacency)
+    root = rng.randrange(n)
+    dist, parent, order = _dijkstra(adjacency, root)
+    weight = np.frombuffer(dist, dtype=np.float64) - _lower_bounds(columns, root)
+    size = [0.0] * n
+    best_child = array("i", [-1]) * n
+    best_size = [0.0] * n
+    has_landmark = bytearray(n)
+    for landmark in chosen:
+        has_landmark[landmark] = 1
+
+    for v in reversed(order):  # i figli sono chiusi dopo il padre
+        p = parent[v]
+        if has_landmark[v]:
+            size[v] = 0.0
+            if p != -1:
+                has_landmark[p] = 1
+            continue
+        size[v] += weight[v]
+        if p != -1:
+            size[p] += size[v]
+            if size[v] > best_size[p]:
+                best_size[p] = size[v]
+                best_child[p] = v
+
+    v = root
+    while best_child[v] != -1:
+        v = best_child[v]
+    if has_landmark[v]:  # ogni sottoalbero della radice contiene già un landmark
+        free = [u for u in order if u not in chosen]
+        return rng.choice(free) if free else None
+    return v
+
+
+def _next_random(adjacency, columns, chosen, rng):
+    free = [v for v in range(len(adjacency)) if v not in chosen]
+    return rng.choice(free) if free else None
+
+
+_SELECTORS = {
+    "farthest": _next_farthest,
+    "avoid": _next_avoid,
+    "random": _next_random,
+}
+
+
+class LandmarkHeuristic:
+    """
+    Euristica ALT da passare ad astar_graph (o astar_many) come heuristic, senza pos:
+    riceve gli id dei nodi, non le coordinate.
+
+    :param nodes: nodi nell'ordine degli indici (list(graph))
+    :param landmarks: indici dei landmark
+    :param table: array('d') n * k, le k distanze dai landmark di ciascun nodo contigue
+                  (riga del nodo i = table[i * k:(i + 1) * k]), 0 dove il landmark non raggiunge il nodo
+    """
+
+    node_ids = True  # astar_graph non sostituisce gli id con le coordinate di un CSRGraph
+
+    def __init__(self, nodes, landmarks, table):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.landmarks = landmarks
+        self.k = len(landmarks)
+        self.table = table
+        self._goal = None
+        self._goal_row = None
+
+    def row(self, node):
+        """Distanze del nodo dai k landmark."""
+        i = self.index[node] * self.k
+        return self.table[i:i + self.k]
+
+    def landmark_nodes(self):
+        return [self.nodes[i] for i in self.landmarks]
+
+    def distances(self):
+        """Tabella NumPy n x k (senza copia)."""
+        return np.frombuffer(self.table, dtype=np.float64).reshape(len(self.nodes), self.k)
+
+    def __call__(self, node, goal):
+        if goal != self._goal:  # la riga del goal è la stessa per tutta la query
+            self._goal = goal
+            self._goal_row = self.row(goal)
+        return max(map(abs, map(sub, self._goal_row, self.row(node))))
+
+
+def build_landmarks(graph, k=8, method="avoid", seed=0):
+    """
+    Sceglie k landmark e calcola le distanze di tutti i nodi da ciascuno (k Dijkstra complete).
+
+    :param graph: dizionario {nodo: [(vicino, peso), ...]} o CSRGraph, non orientato
+    :param method: "farthest" (ogni landmark il più lontano da quelli già scelti), "avoid"
+                   (Goldberg e Harrelson, copre le zone dove l'euristica attuale è peggiore) o "random"
+    :return: LandmarkHeuristic; meno di k landmark se il grafo ha meno nodi utili
+    :raises ValueError: se non si trova nemmeno un landmark (grafo vuoto o senza archi)
+    """
+    if method not in _SELECTORS:
+        raise ValueError(f"Metodo dei landmark non valido: usa uno tra {', '.join(LANDMARK_METHODS)}")
+    if k < 1:
+        raise ValueError("Serve almeno un landmark")
+    nodes, _, adjacency, _ = index_graph(graph)
+    rng = random.Random(seed)
+    chosen = []
+    columns = []
+
+    while len(chosen) < min(k, len(nodes)):
+        landmark = _SELECTORS[method](adjacency, columns, chosen, rng)
+        if landmark is None:
+            break
+        chosen.append(landmark)
+        columns.append(np.frombuffer(_dijkstra(adjacency, landmark)[0], dtype=np.float64))
+
+    if not columns:
+        raise ValueError("Nessun landmark utile: il grafo non ha archi di peso positivo")
+    return _make_heuristic(nodes, chosen, np.stack(columns, axis=1))
+
+
+def _make_heuristic(nodes, landmarks, dist):
+    dist = np.where(np.isinf(dist), 0, dist)
+    table = array("d")
+    table.frombytes(np.ascontiguousarray(dist, dtype=np.float64).tobytes())
+    return LandmarkHeuristic(nodes, list(landmarks), table)
+
+
+def graph_key(graph, *params):
+    """Impronta del grafo e dei parametri usata per riconoscere i dati precalcolati salvati (landmark, gerarchie)."""
+    digest = hashlib.sha1()
+    if isinstance(graph, CSRGraph):
+        for data in (graph.indptr, graph.indices, graph.weights):
+            digest.update(np.ascontiguousarray(data).tobytes())
+        if graph.nodes is not None:
+            digest.update(repr(graph.nodes).encode())
+    else:
+        for node in graph:
+            digest.update(repr((node, list(graph[node]))).encode())
+    digest.update(":".join(map(str, params)).encode())
+    return digest.hexdigest()
+
+
+def save_landmarks(heuristic, filename, key=""):
+    """Salva indici dei landmark e tabella n x k in un .npz (gli id dei nodi li dà il grafo al caricamento)."""
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    np.savez(filename, key=np.array(key), landmarks=np.array(heuristic.landmarks, dtype=np.int64),
+             dist=heuristic.distances())
+
+
+def load_landmarks(filename, graph):
+    """
+    :param graph: lo stesso grafo usato per costruirli, per ricostruire gli id dei nodi
+    """
+    with np.load(filename) as data:
+        dist = data["dist"]
+        landmarks = data["landmarks"].tolist()
+    nodes = list(graph)
+    if len(nodes) != dist.shape[0]:
+        raise ValueError(f"{filename}: {dist.shape[0]} nodi salvati, il grafo ne ha {len(nodes)}")
+    return _make_heuristic(nodes, landmarks, dist)
+
+
+def load_or_build_landmarks(graph, k=8, method="avoid", seed=0, cache_dir="cache/alt"):
+    """
+    Riusa i landmark salvati in cache_dir se grafo e parametri sono gli stessi, altrimenti li costruisce e li salva.
+    """
+    key = graph_key(graph, k, method, seed)
+    filename = os.path.join(cache_dir, f"alt_{key}.npz")
+    if os.path.exists(filename):
+        return load_landmarks(filename, graph)
+    heuristic = build_landmarks(graph, k, method, seed)
+    save_landmarks(heuristic, filename, key)
+    return heuristic
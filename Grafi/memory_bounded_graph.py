@@ -0,0 +1,29 @@
+# memory_bounded_graph.py
+# IDA* e SMA* su grafi {nodo: [(vicino, peso), ...]}. Le ricerche sono condivise con 2D/:
+# l'implementazione è in common/memory_bounded.py e il grafo è già una funzione
+# successors(nodo) -> [(vicino, costo), ...] (graph.__getitem__).
+import os
+import sys
+
+_COMMON = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common"))
+if _COMMON not in sys.path:
+    sys.path.append(_COMMON)
+
+from memory_bounded import INF, SMANode, ida_star_search, sma_star_search  # noqa: E402
+
+
+def _graph_h(heuristic, goal_id, pos):
+    if pos:
+        goal_pos = pos[goal_id]
+        return lambda node: heuristic(pos[node], goal_pos)
+    return lambda node: heuristic(node, goal_id)
+
+
+def ida_star_graph(graph, start_id, goal_id, heuristic, pos=None, table_size=None, bound_growth=0.0):
+    """IDA* su grafo; stats come astar_graph più re_expansions e peak_stored_nodes."""
+    return ida_star_search(start_id, goal_id, graph.__getitem__, _graph_h(heuristic, goal_id, pos), table_size, bound_growth)
+
+
+def sma_star_graph(graph, start_id, goal_id, heuristic, pos=None, max_nodes=10000):
+    """SMA* su grafo con al più max_nodes nodi in memoria."""
+    return sma_star_search(start_id, goal_id, graph.__getitem__, _graph_h(heuristic, goal_id, pos), max_nodes)
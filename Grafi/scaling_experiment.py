@@ -6,6 +6,7 @@ import csv
 import time
 from astar_graph import astar_graph, manhattan_heuristic, euclidean_heuristic
 from researchgraphalgo import bfs, dfs
+from landmarks_graph import build_landmarks
 from generate_graph import generate_random_geometric_graph, get_most_distant_nodes_weighted
 
 
@@ -22,6 +23,8 @@ algos = {
     "astar_null": lambda g, s, t, pos: astar_graph(g, s, t, heuristic=lambda a, b: 0),
     "astar_manhattan": lambda g, s, t, pos: astar_graph(g, s, t, heuristic=manhattan_heuristic, pos=pos),
     "astar_euclidean": lambda g, s, t, pos: astar_graph(g, s, t, heuristic=euclidean_heuristic, pos=pos),
+    # ALT: landmarks è ricalcolato per ogni grafo nel ciclo qui sotto
+    "astar_alt": lambda g, s, t, pos: astar_graph(g, s, t, heuristic=landmarks),
     "bfs": lambda g, s, t, pos: bfs(g, s, t),
     "dfs": lambda g, s, t, pos: dfs(g, s, t),
 }
@@ -34,6 +37,8 @@ for n in node_sizes:
 
         G, pos = generate_random_geometric_graph(n=n, r=0.25)
         graph_dict = {node: [(v, data["weight"]) for v, data in G[node].items()] for node in G.nodes()}
+        landmarks = build_landmarks(graph_dict, k=8, method="avoid")
+        expanded = {}
         start, goal = get_most_distant_nodes_weighted(G)
 
         with open(filename, mode="a", newline="") as file:
@@ -50,6 +55,7 @@ for n in node_sizes:
                 try:
                     path, stats = func(graph_dict, start, goal, pos)
                     t1 = time.perf_counter()
+                    expanded[algo_name] = stats["nodi_espansi"]
 
                     writer.writerow({
                         "graph": graph_name,
@@ -68,3 +74,8 @@ for n in node_sizes:
                     })
                 except Exception as e:
                     print(f"Errore con {algo_name} su {graph_name} trial {trial}: {e}")
+
+        if "astar_alt" in expanded and expanded.get("astar_null"):
+            reduction = 1 - expanded["astar_alt"] / expanded["astar_null"]
+            print(f"{graph_name} trial {trial}: ALT espande {expanded['astar_alt']} nodi contro "
+                  f"{expanded['astar_null']} di astar_null ({reduction:.0%} in meno)")
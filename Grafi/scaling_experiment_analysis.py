@@ -56,4 +56,11 @@ plt.tight_layout()
 plt.savefig(os.path.join(output_dir, "scaling_path_cost.png"))
 plt.close()
 
+# riduzione media dei nodi espansi rispetto ad astar_null (Dijkstra), es. per astar_alt
+baseline = df_all[df_all["algo"] == "astar_null"].groupby("n_nodes")["nodes_expanded"].mean()
+expanded = df_all.groupby(["n_nodes", "algo"])["nodes_expanded"].mean().unstack("algo")
+reduction = 1 - expanded.div(baseline, axis=0)
+reduction.round(3).to_csv(os.path.join(output_dir, "expansion_reduction.csv"))
+print(reduction.round(3))
+
 print(f"✅ Grafici salvati in: {output_dir}")
@@ -0,0 +1,28 @@
+# test_landmarks_graph.py
+# Regressione: build_landmarks su grafi non connessi (nodi isolati).
+import pytest
+
+from landmarks_graph import LANDMARK_METHODS, build_landmarks
+
+
+@pytest.mark.parametrize("method", LANDMARK_METHODS)
+@pytest.mark.parametrize("seed", range(10))
+def test_isolated_node(method, seed):
+    graph = {0: [(1, 1)], 1: [(0, 1)], 2: []}
+    heuristic = build_landmarks(graph, k=2, method=method, seed=seed)
+    assert 1 <= heuristic.k <= 2
+    assert heuristic(0, 1) <= 1  # ammissibile: d(0, 1) = 1
+
+
+def test_two_components_farthest():
+    # due cammini separati più un nodo isolato: la radice casuale può cadere ovunque
+    graph = {0: [(1, 2)], 1: [(0, 2), (2, 3)], 2: [(1, 3)], 3: [(4, 1)], 4: [(3, 1)], 5: []}
+    for seed in range(20):
+        heuristic = build_landmarks(graph, k=3, method="farthest", seed=seed)
+        assert heuristic(0, 2) <= 5
+        assert heuristic(3, 4) <= 1
+
+
+def test_no_edges():
+    with pytest.raises(ValueError):
+        build_landmarks({0: [], 1: []}, k=2, method="farthest")
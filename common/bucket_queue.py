@@ -0,0 +1,150 @@
+# bucket_queue.py
+# Open list alternative a heapq per ricerche con priorità intere, condivisa da 2D/ (costi unitari
+# o interi, euristica manhattan o nulla sulla griglia 4-connessa) e Grafi/ (pesi interi come quelli
+# di generate_graph, euristica nulla o manhattan su posizioni intere):
+# - DialQueue: un bucket per valore di f, l'estrazione scorre i bucket in avanti, O(1) ammortizzato
+#   quando i costi sono piccoli;
+# - RadixQueue: bucket per bit più significativo diverso dall'ultima chiave estratta,
+#   O(log C) ammortizzato anche con costi grandi, ma richiede chiavi monotone.
+# Le voci sono le stesse tuple (f, tie-breaking, contatore, elemento) di heapq: cambia solo
+# la struttura, il ciclo di ricerca resta identico. Il bucket da cui si estrae è un piccolo heap
+# (heapify quando diventa corrente, heappush per le voci che arrivano allo stesso f), quindi a
+# parità di f l'ordine è quello di heapq e ogni politica di tie-breaking resta valida.
+from functools import partial
+from heapq import heapify, heappush, heappop
+
+QUEUES = ("auto", "heap", "dial", "radix")
+
+# oltre questo costo massimo per mossa i bucket di Dial restano quasi tutti vuoti
+DIAL_MAX_COST = 64
+
+
+class DialQueue:
+    """
+    Bucket queue di Dial: buckets[f] = voci con quella priorità, current = minima f non vuota.
+    Accetta anche chiavi minori dell'ultima estratta (euristica non consistente): current
+    torna indietro, l'ordine resta corretto.
+    """
+    __slots__ = ("buckets", "current", "sorted_key", "size")
+
+    def __init__(self):
+        self.buckets = {}
+        self.current = 0
+        self.sorted_key = None  # bucket corrente, tenuto come heap
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, entry):
+        key = entry[0]
+        if key % 1:
+            raise ValueError("DialQueue: la priorità deve essere intera, usa queue='heap'")
+        bucket = self.buckets.get(key)  # 5.0 e 5 sono la stessa chiave
+        if bucket is None:
+            self.buckets[key] = [entry]
+        elif key == self.sorted_key:
+            heappush(bucket, entry)
+        else:
+            bucket.append(entry)
+        if key < self.current or not self.size:
+            self.current = key
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        current = self.current
+        bucket = buckets.get(current)
+        while not bucket:
+            if bucket is not None:
+                del buckets[current]
+            current += 1
+            bucket = buckets.get(current)
+        if current != self.sorted_key:
+            heapify(bucket)
+            self.sorted_key = current
+        self.current = current
+        self.size -= 1
+        return heappop(bucket)
+
+
+class RadixQueue:
+    """
+    Radix heap: la voce con chiave k sta nel bucket (k xor last).bit_length(), dove last è
+    l'ultima chiave estratta. Quando il bucket 0 è vuoto si svuota il primo bucket non vuoto
+    ridistribuendolo rispetto al suo minimo: ogni voce scende di bucket al più log C volte.
+    Il bucket 0 (chiave uguale a last) è un heap, per l'ordine a parità di chiave.
+    """
+    __slots__ = ("buckets", "last", "size")
+
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, entry):
+        key = int(entry[0])
+        if key != entry[0] or key < self.last:
+            raise ValueError("RadixQueue: le priorità devono essere intere e non decrescenti, usa queue='heap'")
+        i = (key ^ self.last).bit_length()
+        if i:
+            self.buckets[i].append(entry)
+        else:
+            heappush(self.buckets[0], entry)
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            last = int(min(entry[0] for entry in bucket))
+            for entry in bucket:
+                buckets[(int(entry[0]) ^ last).bit_length()].append(entry)
+            bucket.clear()
+            heapify(buckets[0])
+            self.last = last
+        self.size -= 1
+        return heappop(buckets[0])
+
+
+def make_queue(queue):
+    """
+    :param queue: "heap", "dial" o "radix"
+    :return: (open_list, push, pop); open_list supporta len()
+    """
+    if queue == "heap":
+        heap = []
+        return heap, partial(heappush, heap), partial(heappop, heap)
+    if queue == "dial":
+        open_list = DialQueue()
+    elif queue == "radix":
+        open_list = RadixQueue()
+    else:
+        raise ValueError(f"queue non valida: usa uno tra {', '.join(QUEUES)}")
+    return open_list, open_list.push, open_list.pop
+
+
+def select_queue(queue, integer_keys, max_cost, monotone=True):
+    """
+    Risolve queue="auto": Dial con chiavi intere e costi piccoli, radix con costi grandi
+    (solo se le chiavi sono monotone), altrimenti heap.
+
+    :param integer_keys: True se g e h sono sempre interi
+    :param max_cost: costo massimo di una mossa
+    :param monotone: True se f non decresce lungo le estrazioni (euristica consistente)
+    """
+    if queue != "auto":
+        if queue not in QUEUES:
+            raise ValueError(f"queue non valida: usa uno tra {', '.join(QUEUES)}")
+        return queue
+    if not integer_keys:
+        return "heap"
+    if max_cost <= DIAL_MAX_COST or not monotone:
+        return "dial"
+    return "radix"
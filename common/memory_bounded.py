@@ -0,0 +1,254 @@
+# memory_bounded.py
+# Ricerche a memoria limitata, condivise da 2D/ (griglie troppo grandi per open list e catene di Node)
+# e Grafi/ (grafi {nodo: [(vicino, peso), ...]}):
+# - IDA*: visita in profondità con soglia su f crescente; la memoria è il percorso corrente
+#   più una tabella di trasposizione (stato -> miglior g dell'iterazione) di dimensione limitabile;
+# - SMA*: A* con al più max_nodes nodi in memoria; quando il budget è pieno si dimentica la foglia
+#   peggiore e il suo f viene conservato nel padre, che la rigenera se torna a essere promettente.
+# Entrambe lavorano su una funzione successors(stato) -> [(vicino, costo), ...]: gli adattatori
+# sono in 2D/memory_bounded2D.py (griglia di astarh) e Grafi/memory_bounded_graph.py (graph[nodo]).
+# Si paga in tempo (re_expansions) quello che si risparmia in memoria. peak_stored_nodes conta gli
+# stati tenuti in memoria, non i byte: per la memoria reale del processo serve tracemalloc.
+import itertools
+from heapq import heappush, heappop, heapify
+
+INF = float("inf")
+
+
+def ida_star_search(start, goal, successors, h, table_size=None, bound_growth=0.0):
+    """
+    IDA* con tabella di trasposizione: nella stessa iterazione uno stato già raggiunto
+    con g non peggiore viene potato. Con table_size la tabella smette di crescere
+    oltre quel numero di stati (la ricerca resta corretta, pota solo meno).
+    Con costi reali ogni iterazione alza la soglia di pochissimo: bound_growth > 0 la alza
+    almeno del fattore (1 + bound_growth), e il costo resta entro quel fattore dall'ottimo.
+
+    :param successors: funzione stato -> [(vicino, costo), ...]
+    :param h: funzione stato -> stima del costo fino a goal
+    :return: (path, stats); re_expansions conta le espansioni ripetute: tutte quelle delle
+             iterazioni precedenti più gli stati riespansi con g migliore nella stessa iterazione,
+             peak_stored_nodes il massimo di stati in tabella più quelli sul percorso corrente
+    """
+    bound = h(start)
+    lower = bound  # limite inferiore dell'ottimo: la minima f scartata dall'iterazione precedente
+    expanded = 0
+    re_expanded = 0
+    nodes_generated = 0
+    peak_nodes = 1
+    iterations = 0
+
+    while True:
+        iterations += 1
+        table = {start: 0}
+        path = [start]
+        on_path = {start}
+        g_path = [0]
+        stack = [iter(successors(start))]
+        next_bound = INF
+        iteration_expanded = 1
+        iteration_repeats = 0
+        found = start == goal
+
+        while stack and not found:
+            try:
+                succ, cost = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                on_path.discard(path.pop())
+                g_path.pop()
+                continue
+            if succ in on_path:
+                continue
+            g = g_path[-1] + cost
+            f = g + h(succ)
+            nodes_generated += 1
+            if f > bound:
+                next_bound = min(next_bound, f)
+                continue
+            seen = table.get(succ)
+            if seen is not None:
+                if g >= seen:
+                    continue
+                iteration_repeats += 1
+            if seen is not None or table_size is None or len(table) < table_size:
+                table[succ] = g
+
+            path.append(succ)
+            on_path.add(succ)
+            g_path.append(g)
+            if succ == goal:
+                found = True
+                break
+            stack.append(iter(successors(succ)))
+            iteration_expanded += 1
+            peak_nodes = max(peak_nodes, len(table) + len(path))
+
+        expanded += iteration_expanded
+        if found or next_bound == INF:
+            re_expanded += iteration_repeats
+            break
+        re_expanded += iteration_expanded
+        lower = next_bound
+        bound = max(next_bound, bound * (1 + bound_growth))
+
+    stats = {
+        "nodi_espansi": expanded,
+        "lunghezza_percorso": len(path) if found else 0,
+        "path_cost": g_path[-1] if found else 0,
+        "nodes_generated": nodes_generated,
+        "re_expansions": re_expanded,
+        "peak_stored_nodes": peak_nodes,
+        "iterations": iterations,
+        "suboptimality_bound": max(1.0, g_path[-1] / lower) if found and lower > 0 else 1.0
+    }
+    return (path if found else None), stats
+
+
+class SMANode:
+    __slots__ = ("state", "parent", "g", "f", "depth", "children", "forgotten", "expanded", "repeat", "token")
+
+    def __init__(self, state, parent, g, f, depth):
+        self.state = state
+        self.parent = parent
+        self.g = g
+        self.f = f              # f con pathmax, poi il minimo dei figli (backup)
+        self.depth = depth
+        self.children = {}      # stato -> SMANode dei figli in memoria
+        self.forgotten = INF    # miglior f tra i figli dimenticati
+        self.expanded = False
+        self.repeat = False     # rigenerato dopo essere stato dimenticato: la sua espansione è ripetuta
+        self.token = None       # voce valida negli heap, None se il nodo non è in open
+
+
+def sma_star_search(start, goal, successors, h, max_nodes=10000):
+    """
+    SMA* (Russell) con espansione completa: al più max_nodes nodi in memoria (dopo ogni potatura).
+    Ottimo se max_nodes supera la profondità della soluzione più il fattore di diramazione,
+    altrimenti restituisce None. Un duplicato viene scartato solo se lo stesso stato è in memoria
+    con g non peggiore: se il goal non è raggiungibile la ricerca può esplorare moltissimi percorsi
+    fino alla profondità max_nodes, conviene escludere prima quel caso.
+
+    :param successors: funzione stato -> [(vicino, costo), ...]
+    :param h: funzione stato -> stima del costo fino a goal
+    :return: (path, stats); re_expansions conta le espansioni ripetute (nodi riespansi per
+             rigenerare i figli dimenticati e nodi dei sottoalberi rigenerati), pruned_nodes
+             i nodi dimenticati per restare nel budget, peak_stored_nodes il massimo di nodi in memoria
+    """
+    root = SMANode(start, None, 0, h(start), 0)
+    open_heap = []   # (chiave, -profondità, token, nodo): prima f minimo, poi il più profondo
+    leaf_heap = []   # (-f, profondità, token, nodo): la foglia peggiore da dimenticare
+    best = {start: root}  # stato -> nodo in memoria con g minore, per scartare i duplicati
+    counter = itertools.count()
+    stored = 1
+    peak_nodes = 1
+    expanded = 0
+    re_expanded = 0
+    pruned = 0
+    nodes_generated = 0
+
+    def push(node):
+        # (re)inserisce il nodo in open, invalidando le voci precedenti
+        node.token = next(counter)
+        key = node.forgotten if node.children else node.f
+        heappush(open_heap, (key, -node.depth, node.token, node))
+        if not node.children and node.parent is not None:
+            heappush(leaf_heap, (-node.f, node.depth, node.token, node))
+
+    def backup(node):
+        while node is not None and node.expanded:
+            new_f = min([child.f for child in node.children.values()] + [node.forgotten])
+            if new_f == node.f:
+                break
+            node.f = new_f
+            if node.token is not None:
+                push(node)
+            node = node.parent
+
+    def compact(heap):
+        # le voci obsolete non devono far crescere la memoria oltre il budget
+        heap[:] = [entry for entry in heap if entry[3].token == entry[2]]
+        heapify(heap)
+
+    push(root)
+    while True:
+        while open_heap and open_heap[0][3].token != open_heap[0][2]:
+            heappop(open_heap)
+        if not open_heap or open_heap[0][0] == INF:
+            return None, {
+                "nodi_espansi": expanded,
+                "lunghezza_percorso": 0,
+                "path_cost": 0,
+                "nodes_generated": nodes_generated,
+                "re_expansions": re_expanded,
+                "pruned_nodes": pruned,
+                "peak_stored_nodes": peak_nodes
+            }
+
+        node = heappop(open_heap)[3]
+        node.token = None
+        if node.state == goal:
+            path = []
+            cost = node.g
+            while node is not None:
+                path.append(node.state)
+                node = node.parent
+            path.reverse()
+            return path, {
+                "nodi_espansi": expanded,
+                "lunghezza_percorso": len(path),
+                "path_cost": cost,
+                "nodes_generated": nodes_generated,
+                "re_expansions": re_expanded,
+                "pruned_nodes": pruned,
+                "peak_stored_nodes": peak_nodes
+            }
+
+        repeat = node.expanded or node.repeat
+        if repeat:
+            re_expanded += 1
+        node.expanded = True
+        node.forgotten = INF
+        expanded += 1
+        parent_state = node.parent.state if node.parent is not None else None
+
+        for succ, cost in successors(node.state):
+            if succ == parent_state or succ in node.children:
+                continue
+            g = node.g + cost
+            known = best.get(succ)
+            if known is not None and known.g <= g:
+                continue  # lo stesso stato è già in memoria con g non peggiore
+            child = SMANode(succ, node, g, max(g + h(succ), node.f), node.depth + 1)
+            if child.depth >= max_nodes - 1 and succ != goal:
+                child.f = INF  # non c'è memoria per andare più a fondo
+            child.repeat = repeat
+            node.children[succ] = child
+            best[succ] = child
+            stored += 1
+            nodes_generated += 1
+            push(child)
+        peak_nodes = max(peak_nodes, stored)
+        backup(node)
+        if not node.children:
+            push(node)  # vicolo cieco (f = INF): deve restare potabile
+
+        while stored > max_nodes:
+            while leaf_heap and (leaf_heap[0][3].token != leaf_heap[0][2] or leaf_heap[0][3].children):
+                heappop(leaf_heap)
+            if not leaf_heap:
+                break
+            worst = heappop(leaf_heap)[3]
+            worst.token = None
+            parent = worst.parent
+            del parent.children[worst.state]
+            if best.get(worst.state) is worst:
+                del best[worst.state]
+            stored -= 1
+            pruned += 1
+            parent.forgotten = min(parent.forgotten, worst.f)
+            push(parent)
+
+        if len(open_heap) > 4 * max_nodes:
+            compact(open_heap)
+        if len(leaf_heap) > 4 * max_nodes:
+            compact(leaf_heap)
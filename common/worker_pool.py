@@ -0,0 +1,97 @@
+# worker_pool.py
+# Pool di processi per molte ricerche indipendenti sullo stesso grafo o sulla stessa griglia,
+# condiviso da 2D/ (batch2D) e Grafi/ (batch_graph, distance_matrix_graph, diameter_graph).
+# Ogni processo riceve una volta sola, nell'initializer, i dati pesanti (griglia preparata,
+# grafo indicizzato) e costruisce il proprio task con setup(*args): di solito una closure che
+# tiene anche dei buffer di ricerca riutilizzati. Poi gli elementi viaggiano a lotti di batch_size.
+# Con workers <= 1 non si crea alcun processo: il task gira nel processo corrente.
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# task di ciascun processo del pool, impostato una sola volta da _init_worker
+_worker_state = {}
+
+
+def _init_worker(setup, args):
+    _worker_state["task"] = setup(*args)
+
+
+def _run_batch(first_index, items):
+    task = _worker_state["task"]
+    return first_index, [task(item) for item in items]
+
+
+def batches(items, batch_size):
+    """(indice del primo elemento, lotto) per lotti consecutivi di batch_size elementi."""
+    for i in range(0, len(items), batch_size):
+        yield i, items[i:i + batch_size]
+
+
+class WorkerPool:
+    """
+    :param setup: funzione di modulo (picklable) setup(*args) -> task, con task(elemento) -> risultato
+    :param args: dati passati a setup, copiati una volta per processo
+    :param workers: numero di processi; con 1 tutto gira nel processo corrente
+    :param batch_size: elementi per task inviato al pool
+    """
+
+    def __init__(self, setup, args=(), workers=1, batch_size=256):
+        self.batch_size = batch_size
+        if workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(setup, args))
+            self.task = None
+        else:
+            self.pool = None
+            self.task = setup(*args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def map(self, items):
+        """Risultati nell'ordine di items."""
+        items = list(items)
+        if self.pool is None:
+            return [self.task(item) for item in items]
+        results = [None] * len(items)
+        futures = [self.pool.submit(_run_batch, i, batch) for i, batch in batches(items, self.batch_size)]
+        for future in futures:
+            first_index, batch_results = future.result()
+            results[first_index:first_index + len(batch_results)] = batch_results
+        return results
+
+    def imap_unordered(self, items):
+        """Generatore di (indice, risultato) nell'ordine di completamento."""
+        items = list(items)
+        if self.pool is None:
+            yield from enumerate(map(self.task, items))
+            return
+        futures = [self.pool.submit(_run_batch, i, batch) for i, batch in batches(items, self.batch_size)]
+        for future in as_completed(futures):
+            first_index, batch_results = future.result()
+            for offset, result in enumerate(batch_results):
+                yield first_index + offset, result
+
+
+def _stream(items, setup, args, workers, batch_size):
+    with WorkerPool(setup, args, workers, batch_size) as pool:
+        yield from pool.imap_unordered(items)
+
+
+def run_batches(items, setup, args=(), workers=1, batch_size=256, stream=False):
+    """
+    Esegue il task di setup(*args) su ogni elemento di items.
+
+    :return: con stream=False la lista dei risultati nell'ordine di items, con stream=True
+             un generatore di (indice, risultato) nell'ordine di completamento
+    """
+    items = list(items)
+    if stream:
+        return _stream(items, setup, args, workers, batch_size)
+    with WorkerPool(setup, args, workers, batch_size) as pool:
+        return pool.map(items)